@@ -0,0 +1,34 @@
+import pygame
+
+
+class FrameTable:
+    # Right- and left-facing frames of one animation, built once when the
+    # animation is loaded so picking a frame never allocates a Surface
+    def __init__(self, frames):
+        self.right = tuple(frames)
+        self.left = tuple(pygame.transform.flip(frame, True, False) for frame in self.right)
+
+    def __len__(self):
+        return len(self.right)
+
+    def frame(self, index, facing_left=False):
+        frames = self.left if facing_left else self.right
+        return frames[index % len(frames)]
+
+
+class AnimationClock:
+    # One clock shared by every animated sprite of a game. It is advanced once
+    # per tick and sprites derive their frame index from it instead of each
+    # polling pygame.time.get_ticks()
+    def __init__(self, frame_ms=150):
+        self.frame_ms = frame_ms  # Milliseconds for each frame
+        self.elapsed = 0
+        self.frame = 0
+
+    def advance(self, ms):
+        self.elapsed += ms
+        self.frame = int(self.elapsed // self.frame_ms)
+
+    def reset(self):
+        self.elapsed = 0
+        self.frame = 0
@@ -0,0 +1,148 @@
+import queue
+import threading
+
+import pygame
+
+from . Animation import FrameTable
+
+
+def load_scaled(path, size=None):
+    surface = pygame.image.load(path)
+    if size is not None:
+        surface = pygame.transform.scale(surface, size)
+    return surface
+
+
+def convert(surface, alpha=True):
+    # Converting to the display format needs a display mode; without one
+    # (e.g. tooling that runs before set_mode) keep the loaded format
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+class Preloader:
+    # Decodes and scales images on a background thread. The main thread calls
+    # pump() (e.g. once per loading screen frame) to convert the finished
+    # surfaces to the display format and store them in the cache.
+    def __init__(self, cache, jobs):
+        self.cache = cache
+        self.jobs = jobs  # (path, size, alpha) for every image to load
+        self.loaded = 0
+        self.finished = queue.Queue()
+        self.error = None
+        self.thread = threading.Thread(target=self._run, name="asset-preloader", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        try:
+            for path, size, alpha in self.jobs:
+                self.finished.put((path, size, alpha, load_scaled(path, size)))
+        except Exception as error:  # Re-raised on the main thread by pump()
+            self.error = error
+
+    @property
+    def progress(self):
+        return self.loaded / len(self.jobs) if self.jobs else 1.0
+
+    @property
+    def done(self):
+        return self.loaded == len(self.jobs)
+
+    def pump(self):
+        while True:
+            try:
+                path, size, alpha, surface = self.finished.get_nowait()
+            except queue.Empty:
+                break
+            self.cache.store(path, size, surface, alpha)
+            self.loaded += 1
+        if self.error is not None and not self.thread.is_alive() and self.finished.empty():
+            raise self.error
+        return self.done
+
+    def wait(self):
+        self.thread.join()
+        self.pump()
+
+
+class AssetCache:
+    # Process-wide registry of loaded and scaled surfaces, keyed by (path, size).
+    # Every sprite of a kind shares the same frame list, so spawning a sprite
+    # never touches the disk once its animation has been loaded. Images in a
+    # baked asset pack are taken from it instead of their files.
+    def __init__(self):
+        self._surfaces = {}
+        self._frames = {}
+        self._animations = {}
+        self.pack = None
+
+    def use_pack(self, pack):
+        self.pack = pack  # An AssetPack, or None for loose files only
+
+    def image(self, path, size=None, alpha=True):
+        key = (path, size)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            packed = self.pack.surface(path, size, alpha) if self.pack is not None else None
+            surface = self.store(path, size, packed if packed is not None else load_scaled(path, size), alpha)
+        return surface
+
+    def store(self, path, size, surface, alpha=True):
+        # Add an already loaded and scaled surface to the cache
+        surface = convert(surface, alpha)
+        self._surfaces[(path, size)] = surface
+        return surface
+
+    def frames(self, pattern, count, size=None):
+        # pattern is a format string such as 'zombie_walk{}.png', filled with 0..count-1
+        key = (pattern, count, size)
+        frames = self._frames.get(key)
+        if frames is None:
+            frames = tuple(self.image(pattern.format(i), size) for i in range(count))
+            self._frames[key] = frames
+        return frames
+
+    def animation(self, pattern, count, size=None):
+        # Frame table with mirrored variants, shared by every sprite using it
+        key = (pattern, count, size)
+        table = self._animations.get(key)
+        if table is None:
+            table = FrameTable(self.frames(pattern, count, size))
+            self._animations[key] = table
+        return table
+
+    def preload(self, images=(), animations=()):
+        # Start loading (path, size, alpha) images and (pattern, count, size)
+        # animations that are not cached yet on a background thread
+        jobs = list(images)
+        for pattern, count, size in animations:
+            jobs.extend((pattern.format(i), size, True) for i in range(count))
+        jobs = [job for job in jobs if (job[0], job[1]) not in self._surfaces]
+        if self.pack is not None:
+            # Packed images need no decoding, so only the rest go to the thread
+            loose = []
+            for path, size, alpha in jobs:
+                surface = self.pack.surface(path, size, alpha)
+                if surface is None:
+                    loose.append((path, size, alpha))
+                else:
+                    self.store(path, size, surface, alpha)
+            jobs = loose
+        return Preloader(self, jobs)
+
+    def size_bytes(self):
+        # Memory held by the pixel data of every cached surface
+        surfaces = list(self._surfaces.values())
+        for table in self._animations.values():
+            surfaces.extend(table.left)
+        return sum(surface.get_height() * surface.get_pitch() for surface in surfaces)
+
+    def clear(self):
+        self._surfaces.clear()
+        self._frames.clear()
+        self._animations.clear()
+
+
+
+assets = AssetCache()
@@ -0,0 +1,56 @@
+import pygame
+
+from . Assets import convert
+from . Config import SCREEN_HEIGHT, SCREEN_WIDTH, WHITE
+
+
+class BackgroundLayer:
+    # A horizontally repeating image, pre-composed once into a display-format
+    # strip one tile wider than the screen. Any scroll position is then a
+    # single blit of a screen-wide window of the strip. Layers with
+    # transparency are cropped to the rows they actually cover, so a parallax
+    # layer only costs a blit of its own band. For a canvas `scale` times the
+    # screen size the tile is scaled once up front.
+    def __init__(self, image, factor=1.0, y=0, width=SCREEN_WIDTH, scale=1.0):
+        if scale != 1:
+            size = (max(1, round(image.get_width() * scale)), max(1, round(image.get_height() * scale)))
+            image = pygame.transform.smoothscale(image, size)
+        self.factor = factor  # Scroll speed relative to the camera; < 1 looks farther away
+        self.scale = scale
+        self.y = round(y * scale)
+        self.width = round(width * scale)
+        self.tile_width = image.get_width()
+        alpha = bool(image.get_flags() & pygame.SRCALPHA)
+        self.band = image.get_bounding_rect() if alpha else image.get_rect()  # Rows with visible pixels
+        self.band.x, self.band.width = 0, self.tile_width
+        self.opaque = not alpha
+
+        tiles = -(-(self.width + self.tile_width) // self.tile_width)
+        strip = pygame.Surface((tiles * self.tile_width, self.band.height), pygame.SRCALPHA if alpha else 0)
+        for tile in range(tiles):
+            strip.blit(image, (tile * self.tile_width, 0), self.band)
+        self.strip = convert(strip, alpha)
+
+    def draw(self, screen, camera):
+        offset = int(camera.x * self.factor * self.scale) % self.tile_width
+        screen.blit(self.strip, (0, self.y + self.band.y), (offset, 0, self.width, self.band.height))
+
+    def covers(self, height):
+        # True if the layer paints every pixel of a screen this high
+        return self.opaque and self.y + self.band.top <= 0 and self.y + self.band.bottom >= height
+
+
+class Background:
+    # Layers drawn back to front. The first layer normally covers the whole
+    # screen, so nothing has to be cleared first; otherwise the screen is
+    # filled with fill_color before it.
+    def __init__(self, layers, fill_color=WHITE, height=SCREEN_HEIGHT):
+        self.layers = list(layers)
+        self.fill_color = fill_color
+        self.needs_fill = not (self.layers and self.layers[0].covers(height))
+
+    def draw(self, screen, camera):
+        if self.needs_fill:
+            screen.fill(self.fill_color)
+        for layer in self.layers:
+            layer.draw(screen, camera)
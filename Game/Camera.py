@@ -0,0 +1,43 @@
+import pygame
+
+from . Config import SCREEN_HEIGHT, SCREEN_WIDTH
+
+
+class Camera:
+    # Horizontal view offset into the world. Entities keep world coordinates
+    # and only get shifted by the camera when they are drawn.
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, left_edge=200, right_edge=600):
+        self.x = 0
+        self.width = width
+        self.height = height
+        self.left_edge = left_edge  # Screen x of the left edge of the scroll band
+        self.right_edge = right_edge  # Screen x of the right edge of the scroll band
+
+    def scroll(self, dx):
+        self.x += int(dx)
+
+    def keep_in_band(self, rect, direction):
+        # Stop a rect at the edges of the band in the middle of the screen
+        # when it is moving towards that edge
+        if direction > 0 and rect.right - self.x > self.right_edge:
+            rect.right = self.x + self.right_edge
+        elif direction < 0 and rect.left - self.x < self.left_edge:
+            rect.left = self.x + self.left_edge
+
+    def interpolated(self, previous_x, alpha):
+        # Camera between the previous tick's position and this one
+        view = Camera(self.width, self.height, self.left_edge, self.right_edge)
+        view.x = round(previous_x + (self.x - previous_x) * alpha)
+        return view
+
+    def apply(self, rect):
+        # World rect -> screen rect
+        return rect.move(-self.x, 0)
+
+    def to_world(self, x, y):
+        return x + self.x, y
+
+    @property
+    def viewport(self):
+        # Visible part of the world
+        return pygame.Rect(self.x, 0, self.width, self.height)
@@ -4,8 +4,71 @@ import pygame
 
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-FPS = 60
-BACKGROUND_WIDTH = SCREEN_WIDTH
+FPS = 60  # Render rate cap
+TICK_RATE = 60  # Simulation ticks per second; physics is in per-tick units
+MAX_CATCHUP_TICKS = 5  # Ticks run per frame at most before the game falls behind
+IDLE_FPS = 20  # Frame rate of menus and message screens, which only redraw on change
+MESSAGE_MS = 5000  # How long the death, win and high-score screens stay up
+RENDER_MODE = "full"  # "full" redraws every frame, "dirty" only redraws what changed
+BLUR_THREADED = False  # Compute menu/death/win backdrop blurs on a worker thread
+ZOMBIE_SYSTEM = "sprites"  # "sprites" steps each Zombie, "swarm" steps them all in NumPy
+
+# The game is laid out for SCREEN_WIDTH x SCREEN_HEIGHT but drawn into a
+# canvas RENDER_SCALE times that size, which is filtered to fill the window
+# once per frame. "integer" scales by a whole factor instead (sharp pixels,
+# black borders) when one of at least 2 fits. With ADAPTIVE_RESOLUTION the
+# scale steps down through RENDER_SCALES while frames take longer than
+# FRAME_BUDGET_MS, and back up when there is room again; the picture is then
+# always filtered, so it keeps its size.
+WINDOW_SIZE = None  # (width, height); None is the screen size
+FULLSCREEN = False  # Use the whole desktop instead of WINDOW_SIZE
+RENDER_SCALE = 1.0
+SCALE_FILTER = "integer"
+ADAPTIVE_RESOLUTION = False
+RENDER_SCALES = (1.0, 0.75, 0.5)
+FRAME_BUDGET_MS = 1000 / FPS
+
+# Endless mode streams the level in chunks around the camera
+ENDLESS = False
+CHUNK_WIDTH = SCREEN_WIDTH
+CHUNKS_AHEAD = 2  # Chunks generated past the right edge of the screen
+CHUNKS_BEHIND = 1  # Chunks kept past the left edge of the screen
+
+# Per-phase frame profiling; F3 toggles the overlay while it is on
+PROFILE = False
+PROFILE_EXPORT = None  # e.g. "profile.json" or "profile.csv", written on exit
+
+# Every played round is saved here as seed + key log, for replaying; None disables.
+# Recordings named by a high-score entry are kept for as long as the entry;
+# of the others only the RECORD_KEEP newest are kept (None keeps them all).
+RECORD_DIR = "recordings"
+RECORD_KEEP = 50
+
+# Gameplay events (round starts, coins, stomps, spawns, deaths and wins) are
+# buffered in memory and written to rotating files here by a background
+# thread; None disables telemetry. When the writer falls behind, at most
+# TELEMETRY_BUFFER events are held and the oldest ("drop_oldest") or newest
+# ("drop_newest") ones are dropped and counted.
+TELEMETRY_DIR = None
+TELEMETRY_FORMAT = "jsonl"  # or "binary" for packed records
+TELEMETRY_BUFFER = 4096
+TELEMETRY_OVERFLOW = "drop_oldest"
+TELEMETRY_FILE_BYTES = 1 << 20  # Size at which a new file is started
+
+# Entities further than CULL_MARGIN pixels outside the screen are not drawn
+# or animated. Off-screen zombies are either updated every tick ("update"),
+# skipped and fast-forwarded when they come back into view ("patrol"; same
+# results as "update") or stopped until they come back ("freeze").
+CULL_MARGIN = 128
+OFFSCREEN_ZOMBIES = "patrol"
+
+# Startup images baked by `python main.py --bake-assets`; loose files are used when
+# it is missing or out of date. None always loads the loose files.
+ASSET_PACK = "Game/static/assets.pack"
+
+# Parallax layers drawn over the background, back to front, as
+# (image path, size, scroll speed relative to the camera, screen y)
+BACKGROUND_LAYERS = ()
 
 # Colors
 WHITE = (255, 255, 255)
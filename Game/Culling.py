@@ -0,0 +1,72 @@
+import pygame
+
+from . Spatial import SpatialHash
+
+
+class ZombieCulling:
+    # Keeps sprite zombies outside the update area (the viewport plus a
+    # margin) out of the per-tick update. A zombie whose whole patrol range
+    # has left the area is parked: filed by its patrol range and not touched
+    # again until that range overlaps the area. With the "patrol" policy it
+    # then fast-forwards the ticks it missed, so it is exactly where a full
+    # update would have put it; with "freeze" it carries on from where it
+    # was parked. Parked zombies keep their last cell in the zombie grid,
+    # which is never queried outside the update area.
+    def __init__(self, policy="patrol"):
+        self.policy = policy
+        self.awake = {}  # zombie -> None, in the order they were woken
+        self.parked = {}  # zombie -> tick of its last update
+        self.grid = SpatialHash()  # Parked zombies by patrol range
+        self.area = None  # Update area of the last wake()
+
+    def __len__(self):
+        return len(self.awake) + len(self.parked)
+
+    def add(self, zombie):
+        self.awake[zombie] = None
+
+    def remove(self, zombie):
+        self.awake.pop(zombie, None)
+        if self.parked.pop(zombie, None) is not None:
+            self.grid.remove(zombie)
+
+    def wake(self, area, tick):
+        # Call at the start of tick `tick`, before the awake zombies update.
+        # Parked zombies stand still, so only the part of the area that was
+        # not covered last tick can reach new ones.
+        last, self.area = self.area, area
+        if not self.parked or area == last:
+            return
+        exposed = area
+        if last is not None and (last.top, last.bottom) == (area.top, area.bottom) and abs(area.x - last.x) < area.width:
+            if area.x > last.x:
+                exposed = pygame.Rect(last.right, area.y, area.x - last.x, area.height)
+            else:
+                exposed = pygame.Rect(area.x, area.y, last.x - area.x, area.height)
+        for zombie in self.grid.query(exposed):
+            if zombie.patrol_range().colliderect(area):
+                last = self.parked.pop(zombie)
+                self.grid.remove(zombie)
+                if self.policy == "patrol":
+                    zombie.fast_forward(tick - 1 - last)
+                self.awake[zombie] = None
+
+    def park(self, area, tick):
+        # Call after the awake zombies updated on tick `tick`
+        left, top, right, bottom = area.left, area.top, area.right, area.bottom
+        for zombie in list(self.awake):
+            rect = zombie.rect
+            if (zombie.boundary_right + rect.width <= left or zombie.boundary_left >= right
+                    or rect.bottom <= top or rect.top >= bottom):
+                # The whole patrol range is outside the area
+                del self.awake[zombie]
+                self.parked[zombie] = tick
+                self.grid.insert(zombie, zombie.patrol_range())
+
+    def catch_up(self, tick):
+        # Bring parked zombies up to date in place, e.g. for a snapshot
+        if self.policy != "patrol":
+            return
+        for zombie, last in self.parked.items():
+            zombie.fast_forward(tick - last)
+            self.parked[zombie] = tick
@@ -0,0 +1,144 @@
+import os
+
+import pygame
+
+from . Config import BLACK, SCREEN_HEIGHT, SCREEN_WIDTH
+
+SCALE_FILTERS = ("integer", "smooth")
+
+
+def canvas_size(scale):
+    # Internal render resolution of a render scale
+    return max(1, round(SCREEN_WIDTH * scale)), max(1, round(SCREEN_HEIGHT * scale))
+
+
+class Display:
+    # The window and the canvas the game draws into. The canvas has the
+    # internal render resolution, `scale` times the 800x600 screen the game
+    # is laid out in, and present() scales it to the window once per frame.
+    # It is filtered to fill the window as far as the aspect ratio allows,
+    # the same area at every scale. "integer" instead scales by a whole
+    # factor with hard pixel edges and black borders, as long as one of at
+    # least 2 fits; with adaptive scales it never does, so the picture keeps
+    # its size when the scale changes. When canvas and window have the same
+    # size the game draws straight into the window and nothing is scaled.
+    def __init__(self, headless=False, scale=1.0, window_size=None, fullscreen=False, scale_filter="integer",
+                 adaptive=False):
+        if scale_filter not in SCALE_FILTERS:
+            raise ValueError(f"Unknown scale filter {scale_filter!r}")
+        self.headless = headless
+        self.filter = scale_filter
+        self.adaptive = adaptive  # The scale changes while the game runs
+        # Headless runs render through SDL's dummy driver so no window is opened
+        if headless:
+            if pygame.display.get_init() and pygame.display.get_driver() != "dummy":
+                pygame.display.quit()
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+        pygame.init()
+        if headless:
+            self.window = pygame.display.set_mode(canvas_size(scale))  # Never shown, so it is the canvas
+        elif fullscreen:
+            self.window = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)  # Desktop resolution
+        else:
+            self.window = pygame.display.set_mode(window_size or (SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("The Adventures of Py.Man")
+        self.set_scale(scale)
+
+    def set_scale(self, scale):
+        self.scale = scale
+        size = canvas_size(scale)
+        window = self.window.get_rect()
+        self.factor = None  # Whole scale factor; None for filtered scaling
+        self.target = None  # Part of the window the canvas is scaled into
+        self.area = window
+        if size == window.size:
+            self.canvas = self.window
+            return
+        self.canvas = pygame.Surface(size).convert()
+        factor = min(window.width // size[0], window.height // size[1])
+        if self.filter == "integer" and factor >= 2 and not self.adaptive:
+            self.factor = factor
+            self.area = pygame.Rect(0, 0, size[0] * factor, size[1] * factor)
+        else:
+            # Fitted to the screen layout rather than the canvas, so every
+            # scale fills exactly the same area
+            fit = min(window.width / SCREEN_WIDTH, window.height / SCREEN_HEIGHT)
+            self.area = pygame.Rect(0, 0, round(SCREEN_WIDTH * fit), round(SCREEN_HEIGHT * fit))
+        self.area.center = window.center
+        self.target = self.window.subsurface(self.area)
+        self.window.fill(BLACK)  # Borders around the scaled canvas
+        self.full = True  # The borders have not been shown yet
+
+    def present(self, dirty=None):
+        # Show the canvas; dirty is the list of canvas areas that changed,
+        # or None if all of it may have
+        if self.headless:
+            return
+        if self.target is None:
+            if dirty is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty)
+            return
+        if dirty is None or self.factor is None or self.full:
+            self.full = False
+            if self.factor is None:
+                pygame.transform.smoothscale(self.canvas, self.area.size, self.target)
+            else:
+                pygame.transform.scale(self.canvas, self.area.size, self.target)
+            pygame.display.flip()
+            return
+        # Whole factors map every canvas pixel to a block of window pixels,
+        # so only the changed areas need scaling
+        factor = self.factor
+        updated = []
+        for rect in dirty:
+            scaled = pygame.Rect(rect.x * factor, rect.y * factor, rect.width * factor, rect.height * factor)
+            pygame.transform.scale(self.canvas.subsurface(rect), scaled.size, self.target.subsurface(scaled))
+            updated.append(scaled.move(self.area.topleft))
+        pygame.display.update(updated)
+
+
+class AdaptiveResolution:
+    # Picks the render scale from `scales` by frame cost. Every `window`
+    # frames it compares the average frame time (without waiting for the next
+    # frame) with the budget. Over budget it steps down to the next smaller
+    # scale. It steps back up once the larger scale would stay within
+    # `headroom` of the budget, assuming drawing costs grow with the number
+    # of pixels.
+    def __init__(self, scales, budget_ms, scale=1.0, window=30, headroom=0.8):
+        self.scales = sorted(set(scales) | {scale}, reverse=True)
+        self.index = self.scales.index(scale)
+        self.budget = budget_ms
+        self.window = window
+        self.headroom = headroom
+        self.reset()
+
+    @property
+    def scale(self):
+        return self.scales[self.index]
+
+    def reset(self):
+        self.frames = 0
+        self.work = 0.0
+        self.drawing = 0.0
+
+    def frame(self, work_ms, draw_ms):
+        # Returns the scale to switch to, or None to keep the current one
+        self.frames += 1
+        self.work += work_ms
+        self.drawing += draw_ms
+        if self.frames < self.window:
+            return None
+        work = self.work / self.frames
+        drawing = self.drawing / self.frames
+        self.reset()
+        if work > self.budget and self.index + 1 < len(self.scales):
+            self.index += 1
+            return self.scale
+        if self.index > 0:
+            growth = (self.scales[self.index - 1] / self.scale) ** 2
+            if work + drawing * (growth - 1) <= self.budget * self.headroom:
+                self.index -= 1
+                return self.scale
+        return None
@@ -0,0 +1,78 @@
+import numpy as np
+import pygame
+
+
+def box_blur(surface, radius):
+    # Separable box filter over the pixels of a (small) surface using running
+    # sums in NumPy
+    pixels = pygame.surfarray.pixels3d(surface)
+    result = pixels.astype(np.int32)
+    size = 2 * radius + 1
+    for axis in (0, 1):
+        pad = [(0, 0)] * 3
+        pad[axis] = (radius + 1, radius)
+        sums = np.cumsum(np.pad(result, pad, mode="edge"), axis=axis)
+        upper = [slice(None)] * 3
+        lower = [slice(None)] * 3
+        upper[axis] = slice(size, None)
+        lower[axis] = slice(None, -size)
+        result = (sums[tuple(upper)] - sums[tuple(lower)]) // size
+    pixels[...] = result
+    del pixels  # Unlock the surface
+
+
+def blur_surface(surface, downscale=8, radius=2):
+    # Cheap backdrop blur: shrink, box blur the small image, scale back up
+    width, height = surface.get_size()
+    small_size = (max(1, width // downscale), max(1, height // downscale))
+    if surface.get_bitsize() not in (24, 32):
+        surface = surface.convert(32)  # smoothscale only handles 24 and 32 bit surfaces
+    small = pygame.transform.smoothscale(surface, small_size)
+    if radius:
+        box_blur(small, radius)
+    return pygame.transform.smoothscale(small, (width, height))
+
+
+class BackdropBlur:
+    # Blurred copies of a frame for the menu, death and win screens. The last
+    # result is cached under a caller-supplied key (e.g. the number of frames
+    # drawn), so screens shown over the same frame reuse it. With threaded=True
+    # request() computes on a worker thread and ready() can be polled.
+    def __init__(self, downscale=8, radius=2, threaded=False):
+        self.downscale = downscale
+        self.radius = radius
+        self.executor = None
+        if threaded:
+            from concurrent.futures import ThreadPoolExecutor
+            self.executor = ThreadPoolExecutor(max_workers=1)
+        self.key = None
+        self.result = None
+        self.pending = None  # (key, future) of a blur still being computed
+
+    def request(self, surface, key):
+        if key == self.key or (self.pending and self.pending[0] == key):
+            return
+        if self.executor is None:
+            self.key, self.result = key, blur_surface(surface, self.downscale, self.radius)
+        else:
+            # The worker gets its own copy so the caller can keep drawing
+            future = self.executor.submit(blur_surface, surface.copy(), self.downscale, self.radius)
+            self.pending = (key, future)
+
+    def ready(self, key):
+        if self.key == key:
+            return True
+        return bool(self.pending and self.pending[0] == key and self.pending[1].done())
+
+    def get(self, surface, key):
+        # Blurred version of surface, waiting for a pending worker result if needed
+        self.request(surface, key)
+        if self.key != key:
+            pending_key, future = self.pending
+            self.key, self.result = pending_key, future.result()
+            self.pending = None
+        return self.result
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
@@ -0,0 +1,213 @@
+import multiprocessing
+import os
+import random
+from multiprocessing import shared_memory
+
+import numpy as np
+import pygame
+
+from . Config import SCREEN_HEIGHT, SCREEN_WIDTH
+from . Replay import KEY_STATES
+
+NEAREST = 8  # Zombies and coins described in each state observation
+FRAME_SIZE = (80, 60)  # Width and height of frame observations
+PLAYER_FEATURES = 5  # Screen x, y, velocity x, y, on ground
+ACTIONS = len(KEY_STATES)  # Bit masks of A, D and W, like the replay key log
+
+
+def observation_spec(observation="state", nearest=NEAREST, frame_size=FRAME_SIZE):
+    # (shape, dtype) of one observation
+    if observation == "frame":
+        return (frame_size[1], frame_size[0], 3), np.uint8
+    if observation == "state":
+        return (PLAYER_FEATURES + 2 * nearest * 3,), np.float32
+    raise ValueError(f"Unknown observation type {observation!r}")
+
+
+class ActionInput:
+    # Input source driven by the environment instead of the keyboard
+    def __init__(self):
+        self.action = 0
+
+    def get_pressed(self):
+        return KEY_STATES[self.action]
+
+
+class GameEnv:
+    # Step/reset interface around one headless Game. Actions are bit masks of
+    # A (1), D (2) and W (4); the reward is the score gained during the step,
+    # i.e. everything Score.increase_score added. Observations are either the
+    # player state plus the nearest zombies and coins on screen, relative to
+    # the player, or a downsampled RGB frame.
+    def __init__(self, seed=0, observation="state", nearest=NEAREST, frame_size=FRAME_SIZE, max_ticks=None, **options):
+        from . import Game
+
+        self.observation = observation
+        self.nearest = nearest
+        self.frame_size = frame_size
+        self.shape, self.dtype = observation_spec(observation, nearest, frame_size)
+        self.max_ticks = max_ticks  # Rounds are cut off after this many ticks
+        self.seeds = random.Random(seed)  # Seeds of successive rounds
+        self.input = ActionInput()
+        self.game = Game(headless=True, seed=self.seeds.getrandbits(63), input_source=self.input, record=None, **options)
+        self.frame = pygame.Surface(frame_size) if observation == "frame" else None
+
+    def reset(self, out=None):
+        self.game.reset(self.seeds.getrandbits(63))
+        if self.frame is not None:
+            self.game.draw()  # Headless rounds start undrawn
+        return self.observe(out)
+
+    def step(self, action, out=None):
+        # Returns (observation, reward, done)
+        game = self.game
+        self.input.action = action
+        before = game.score.score
+        game.step(1, render=self.frame is not None)
+        reward = game.score.score - before
+        done = not game.running or (self.max_ticks is not None and game.ticks >= self.max_ticks)
+        return self.observe(out), reward, done
+
+    def observe(self, out=None):
+        if out is None:
+            out = np.zeros(self.shape, self.dtype)
+        if self.frame is not None:
+            pygame.transform.smoothscale(self.game.screen, self.frame_size, self.frame)
+            out[...] = pygame.surfarray.pixels3d(self.frame).swapaxes(0, 1)
+            return out
+
+        game = self.game
+        player = game.player.rect
+        out[:PLAYER_FEATURES] = ((player.x - game.camera.x) / SCREEN_WIDTH, player.y / SCREEN_HEIGHT,
+                                 game.player.velocity.x, game.player.velocity.y, game.player.on_ground)
+        viewport = game.camera.viewport
+        if game.swarm is not None:
+            zombies = game.swarm.query(viewport)
+        else:
+            zombies = game.zombie_grid.query(viewport)
+        start = PLAYER_FEATURES
+        for entities in (zombies, game.coin_grid.query(viewport)):
+            self.nearest_entities(player, entities, out[start:start + 3 * self.nearest])
+            start += 3 * self.nearest
+        return out
+
+    def nearest_entities(self, player, entities, out):
+        # (dx, dy, present) of the closest entities, nearest first
+        out[:] = 0
+        if not entities:
+            return
+        offsets = np.array([(rect.centerx - player.centerx, rect.centery - player.centery)
+                            for rect in (entity.rect for entity in entities)], dtype=np.float32)
+        order = np.argsort((offsets ** 2).sum(axis=1), kind="stable")[:self.nearest]
+        rows = out.reshape(self.nearest, 3)
+        rows[:len(order), 0] = offsets[order, 0] / SCREEN_WIDTH
+        rows[:len(order), 1] = offsets[order, 1] / SCREEN_HEIGHT
+        rows[:len(order), 2] = 1
+
+
+def attach(name, shape, dtype):
+    # Map a block created by VectorEnv into this worker process; the parent
+    # owns it and unlinks it on close
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype, buffer=block.buf)
+
+
+def worker(connection, buffers, first, count, seed, kwargs):
+    # Runs envs first .. first + count - 1 and writes their results straight
+    # into the shared arrays; only short commands go through the pipe
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    blocks, arrays = zip(*(attach(*buffer) for buffer in buffers))
+    observations, actions, rewards, dones = arrays
+    envs = [GameEnv(seed + index, **kwargs) for index in range(first, first + count)]
+    try:
+        while True:
+            command = connection.recv()
+            if command == "close":
+                break
+            for index, env in enumerate(envs, start=first):
+                if command == "reset":
+                    env.reset(observations[index])
+                    continue
+                _, reward, done = env.step(int(actions[index]), observations[index])
+                if done:
+                    env.reset(observations[index])  # The next step starts a new round
+                rewards[index] = reward
+                dones[index] = done
+            connection.send(None)
+    finally:
+        del observations, actions, rewards, dones, arrays
+        for block in blocks:
+            block.close()
+
+
+class VectorEnv:
+    # N independent GameEnvs spread over a pool of worker processes. Actions,
+    # observations, rewards and done flags live in shared memory, so a step
+    # only sends a command to every worker and waits for it to finish; no
+    # arrays are pickled. Rounds that end are reset automatically, and the
+    # observation returned for them is the first one of the new round.
+    #
+    # The returned arrays are views of the shared memory and are overwritten
+    # by the next step; copy them to keep them.
+    def __init__(self, count, seed=0, workers=None, observation="state", nearest=NEAREST,
+                 frame_size=FRAME_SIZE, max_ticks=None, **options):
+        self.count = count
+        shape, dtype = observation_spec(observation, nearest, frame_size)
+        specs = [((count,) + shape, dtype), ((count,), np.uint8), ((count,), np.float32), ((count,), np.bool_)]
+        self.blocks = [shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize))
+                       for shape, dtype in specs]
+        self.observations, self.actions, self.rewards, self.dones = (
+            np.ndarray(shape, dtype, buffer=block.buf) for block, (shape, dtype) in zip(self.blocks, specs))
+        buffers = [(block.name, shape, dtype) for block, (shape, dtype) in zip(self.blocks, specs)]
+
+        # Each worker gets a contiguous share of the envs
+        workers = max(1, min(count, workers or os.cpu_count() or 1))
+        kwargs = dict(options, observation=observation, nearest=nearest, frame_size=frame_size, max_ticks=max_ticks)
+        context = multiprocessing.get_context("spawn")  # No pygame state inherited from the parent
+        self.connections = []
+        self.processes = []
+        for worker_index in range(workers):
+            first = count * worker_index // workers
+            last = count * (worker_index + 1) // workers
+            parent, child = context.Pipe()
+            process = context.Process(target=worker, args=(child, buffers, first, last - first, seed, kwargs), daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+        self.closed = False
+
+    def _run(self, command):
+        for connection in self.connections:
+            connection.send(command)
+        for connection in self.connections:
+            connection.recv()
+
+    def reset(self):
+        self._run("reset")
+        return self.observations
+
+    def step(self, actions):
+        # Returns (observations, rewards, dones) for all envs
+        self.actions[:] = actions
+        self._run("step")
+        return self.observations, self.rewards, self.dones
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for connection in self.connections:
+            connection.send("close")
+        for process in self.processes:
+            process.join()
+        del self.observations, self.actions, self.rewards, self.dones
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,209 @@
+import heapq
+import json
+import os
+import queue
+import threading
+import uuid
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+
+
+@contextmanager
+def file_lock(path):
+    # Exclusive lock on a side file that is never replaced, so it keeps
+    # working across compactions of the journal itself
+    with open(path, "a+") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def parse_line(line, offset):
+    # Journal lines are JSON objects; legacy lines are "name,score". Entries
+    # come back as dicts with at least id, name and score, and keep any
+    # other fields (such as replay) so compaction does not drop them.
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        if line.startswith("{"):
+            entry = json.loads(line)
+            entry["score"] = int(entry["score"])
+            return entry if "id" in entry and "name" in entry else None
+        name, score = line.rsplit(",", 1)
+        return {"id": f"@{offset}", "name": name, "score": int(score)}
+    except (ValueError, KeyError, TypeError):
+        return None  # Skip damaged lines rather than losing the whole table
+
+
+class NullHighscores:
+    # Stand-in for headless games, which never show or enter high scores, so
+    # they do not lock or read the shared journal
+    def qualifies(self, score):
+        return False
+
+    def top(self):
+        return []
+
+    def replays(self):
+        return set()
+
+    def add(self, name, score, replay=None):
+        pass
+
+    def refresh(self):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class HighscoreStore:
+    # High scores kept in an append-only journal shared by every game instance
+    # on the machine. Appends happen under a file lock on a background thread,
+    # so the frame loop never waits on disk, and entries written by other
+    # instances are picked up incrementally by refresh(). The best top_n
+    # entries live in a min-heap, which makes qualifies() O(1).
+    def __init__(self, path, top_n=10, compact_size=64 * 1024):
+        self.path = path
+        self.lock_path = path + ".lock"
+        self.top_n = top_n
+        self.compact_size = compact_size  # Journal bytes before it is rewritten with the top entries only
+        self.heap = []  # (score, -sequence, id, name); the lowest kept score is heap[0]
+        self.entries = {}  # Id -> entry of the entries in the heap
+        self.sequence = 0
+        self.offset = 0  # Bytes of the journal read so far
+        self.inode = None
+        self.writes = None  # Queue of the background writer, started on first add
+        self.writer = None
+        self.refresh()
+
+    def _push(self, entry):
+        entry_id, score = entry["id"], entry["score"]
+        if entry_id in self.entries:
+            return
+        self.sequence += 1
+        item = (score, -self.sequence, entry_id, entry["name"])
+        if len(self.heap) < self.top_n:
+            heapq.heappush(self.heap, item)
+        elif score > self.heap[0][0]:
+            self.entries.pop(heapq.heapreplace(self.heap, item)[2], None)
+        else:
+            return
+        self.entries[entry_id] = entry
+
+    def refresh(self):
+        # Read entries appended since the last refresh, or everything again if
+        # the journal was compacted (replaced) in the meantime
+        if not os.path.exists(self.path):
+            return
+        with file_lock(self.lock_path):
+            with open(self.path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                if stat.st_ino != self.inode or stat.st_size < self.offset:
+                    self.inode = stat.st_ino
+                    self.offset = 0
+                    self.heap.clear()
+                    self.entries.clear()
+                f.seek(self.offset)
+                data = f.read()
+        # Writers hold the lock for whole lines, so every line read here is complete
+        offset = self.offset
+        for raw in data.splitlines(keepends=True):
+            entry = parse_line(raw.decode("utf-8", errors="replace"), offset)
+            offset += len(raw)
+            if entry is not None:
+                self._push(entry)
+        self.offset = offset
+
+    def qualifies(self, score):
+        return len(self.heap) < self.top_n or score > self.heap[0][0]
+
+    def top(self):
+        # (name, score) pairs, best first and earlier entries first on ties
+        return [(name, score) for score, _, _, name in sorted(self.heap, reverse=True)]
+
+    def replays(self):
+        # Recordings the kept entries point to
+        return {entry["replay"] for entry in self.entries.values() if entry.get("replay")}
+
+    def add(self, name, score, replay=None):
+        # replay names the round's recording, for auditing the score
+        entry = {"id": uuid.uuid4().hex, "name": name, "score": score}
+        if replay is not None:
+            entry["replay"] = replay
+        self._push(entry)
+        if self.writer is None:
+            self.writes = queue.Queue()
+            self.writer = threading.Thread(target=self._write_loop, name="highscore-writer", daemon=True)
+            self.writer.start()
+        self.writes.put(json.dumps(entry))
+
+    def _write_loop(self):
+        while True:
+            line = self.writes.get()
+            if line is None:
+                self.writes.task_done()
+                return
+            with file_lock(self.lock_path):
+                with open(self.path, "a+b") as f:
+                    size = f.seek(0, os.SEEK_END)
+                    separator = b""
+                    if size:
+                        f.seek(size - 1)
+                        if f.read(1) != b"\n":
+                            separator = b"\n"  # Legacy files may not end with a newline
+                    f.write(separator + line.encode("utf-8") + b"\n")  # One append of a whole line
+                    size = f.tell()
+                if size > self.compact_size:
+                    self._compact()
+            self.writes.task_done()
+
+    def _compact(self):
+        # Rewrite the journal with its best entries only; the caller holds the lock
+        with open(self.path, "rb") as f:
+            data = f.read()
+        entries = []
+        offset = 0
+        for raw in data.splitlines(keepends=True):
+            entry = parse_line(raw.decode("utf-8", errors="replace"), offset)
+            offset += len(raw)
+            if entry is not None:
+                entries.append(entry)
+        best = sorted(enumerate(entries), key=lambda item: (-item[1]["score"], item[0]))[:self.top_n]
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for _, entry in sorted(best, key=lambda item: item[0]):
+                f.write(json.dumps(entry) + "\n")  # Whole entries, replay links included
+        os.replace(temp_path, self.path)
+
+    def flush(self):
+        if self.writes is not None:
+            self.writes.join()
+
+    def close(self):
+        if self.writer is not None:
+            self.writes.put(None)
+            self.writer.join()
+            self.writer = None
@@ -0,0 +1,34 @@
+import pygame
+
+
+class KeyState:
+    # Pressed-key snapshot indexable like pygame.key.get_pressed()
+    def __init__(self, pressed=()):
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+NO_KEYS = KeyState()
+
+
+class KeyboardInput:
+    # Default input source: polls the real keyboard
+    def get_pressed(self):
+        return pygame.key.get_pressed()
+
+
+class ScriptedInput:
+    # Replays a fixed sequence of pressed-key collections, one per tick.
+    # Once the script runs out no keys are reported as pressed.
+    def __init__(self, script=()):
+        self.script = [KeyState(keys) for keys in script]
+        self.position = 0
+
+    def get_pressed(self):
+        if self.position >= len(self.script):
+            return NO_KEYS
+        keys = self.script[self.position]
+        self.position += 1
+        return keys
@@ -0,0 +1,87 @@
+import random
+
+from . Config import CHUNKS_AHEAD, CHUNKS_BEHIND, CHUNK_WIDTH, SCREEN_HEIGHT
+from . Sprites import Platform
+
+
+class LevelStreamer:
+    # Endless level made of fixed-width chunks. Each chunk is generated from
+    # its own seeded RNG just ahead of the camera, and chunks that fall behind
+    # it are evicted for good, so the number of live entities stays constant
+    # however far the player runs.
+    def __init__(self, game, seed, chunk_width=CHUNK_WIDTH, ahead=CHUNKS_AHEAD, behind=CHUNKS_BEHIND):
+        self.game = game
+        self.seed = seed
+        self.chunk_width = chunk_width
+        self.ahead = ahead  # Chunks kept loaded past the right edge of the screen
+        self.behind = behind  # Chunks kept loaded past the left edge of the screen
+        self.chunks = {}  # chunk index -> {entity: kind} of the entities it still owns
+        self.owner = {}  # entity -> chunk index
+        self.first_chunk = 0  # Chunks before this one have been left behind
+        self.window = None
+
+    def chunk_index(self, x):
+        return int(x) // self.chunk_width
+
+    def update(self, camera):
+        # Cheap unless the camera crossed into another chunk
+        first = max(self.first_chunk, self.chunk_index(camera.x) - self.behind)
+        last = self.chunk_index(camera.x + camera.width) + self.ahead
+        if (first, last) == self.window:
+            return
+        self.window = (first, last)
+        self.first_chunk = first
+        for index in [index for index in self.chunks if index < first]:
+            self.evict(index)
+        for index in range(first, last + 1):
+            if index not in self.chunks:
+                self.load(index)
+
+    def load(self, index):
+        game = self.game
+        rng = random.Random(f"{self.seed}:{index}")  # Same chunk for the same seed
+        left = index * self.chunk_width
+        right = left + self.chunk_width - 1
+        self.chunks[index] = {}
+
+        # Keep the start of the first chunk clear like the fixed level does
+        for _ in range(rng.randint(2, 3)):
+            zombie = game.new_zombie(rng.randint(max(left, 400), right), SCREEN_HEIGHT - 70)
+            game.add_zombie(zombie)
+            self.own(index, zombie, "zombie")
+        for _ in range(rng.randint(2, 3)):
+            x_pos = rng.randint(max(left, 100), right)
+            y_pos = rng.randint(SCREEN_HEIGHT - 300, SCREEN_HEIGHT - 60)
+            platform = Platform(x_pos, y_pos, rng.randint(100, 200), 20)
+            game.add_platform(platform)
+            self.own(index, platform, "platform")
+        for _ in range(rng.randint(3, 6)):
+            x_pos = rng.randint(max(left, 200), right)
+            y_pos = rng.randint(SCREEN_HEIGHT - 200, SCREEN_HEIGHT - 60)
+            coin = game.new_coin(x_pos, y_pos)
+            game.add_coin(coin)
+            self.own(index, coin, "coin")
+
+    def own(self, index, entity, kind):
+        self.chunks[index][entity] = kind
+        self.owner[entity] = index
+
+    def forget(self, entity):
+        # Called when an entity leaves the game, e.g. a stomped zombie or a
+        # collected coin, so a later owner of the pooled object is not affected
+        index = self.owner.pop(entity, None)
+        if index is not None:
+            del self.chunks[index][entity]
+
+    def evict(self, index):
+        game = self.game
+        remove = {"zombie": game.remove_zombie, "platform": game.remove_platform, "coin": game.remove_coin}
+        for entity, kind in list(self.chunks[index].items()):
+            remove[kind](entity)  # Calls forget()
+        del self.chunks[index]
+
+    def adopt(self, zombie):
+        # Zombies spawned during play are evicted with the chunk they appear in
+        index = self.chunk_index(zombie.rect.x)
+        index = min(max(index, min(self.chunks)), max(self.chunks))
+        self.own(index, zombie, "zombie")
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+
+import pygame
+
+from . Assets import load_scaled
+
+logger = logging.getLogger(__name__)
+
+# Magic, format version and length of the JSON index that follows; the
+# pixel data of every image comes after the index
+HEADER = struct.Struct("<4sII")
+MAGIC = b"UZWA"
+FORMAT_VERSION = 1
+
+
+def fingerprint(path):
+    # Recorded state of a source file: size, modification time and a hash
+    # of its contents
+    with open(path, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha1": digest}
+
+
+def unchanged(path, recorded):
+    # Checked by size and time stamp first, so a current pack is used
+    # without reading any source file. Files that were only touched (e.g. by
+    # a fresh checkout) are recognised by their hash.
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    if stat.st_size != recorded["size"]:
+        return False
+    if stat.st_mtime_ns == recorded["mtime_ns"]:
+        return True
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest() == recorded["sha1"]
+
+
+def build_pack(path, images):
+    # Bake (path, size, alpha) images into one file. Every image is decoded
+    # and scaled here, once, and stored as raw RGBA (or RGB for opaque
+    # images) rows; loading it later is a slice of the file. Needs a display
+    # mode, so images are normalised the way the game converts them.
+    entries = []
+    chunks = []
+    sources = {}
+    offset = 0
+    for source, size, alpha in images:
+        surface = load_scaled(source, size)
+        surface = surface.convert_alpha() if alpha else surface.convert()
+        pixels = pygame.image.tobytes(surface, "RGBA" if alpha else "RGB")
+        width, height = surface.get_size()
+        entries.append({"path": source, "size": list(size) if size else None, "alpha": alpha,
+                        "width": width, "height": height, "offset": offset})
+        chunks.append(pixels)
+        offset += len(pixels)
+        sources[source] = fingerprint(source)
+    index = json.dumps({"sources": sources, "images": entries}).encode("utf-8")
+
+    # Written next to the target and moved into place, so a running game
+    # never maps a half-written pack
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(index)))
+        f.write(index)
+        for pixels in chunks:
+            f.write(pixels)
+    os.replace(temp_path, path)
+    return len(entries), HEADER.size + len(index) + offset
+
+
+class AssetPack:
+    # A baked pack, memory-mapped. surface() slices an image's pixels out of
+    # the mapping without decoding or copying them; images whose source file
+    # changed since baking are left to the loose files.
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            # Copy-on-write, so surfaces can wrap the pages; nothing is ever written back
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, version, index_size = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"not an asset pack of format version {FORMAT_VERSION}")
+        index = json.loads(self.map[HEADER.size:HEADER.size + index_size])
+        self.data = HEADER.size + index_size  # Start of the pixel data
+        end = max((self.data + entry["offset"] + entry["width"] * entry["height"] * (4 if entry["alpha"] else 3)
+                   for entry in index["images"]), default=self.data)
+        if len(self.map) < end:
+            raise ValueError("the file is truncated")
+        self.stale = sorted(source for source, recorded in index["sources"].items() if not unchanged(source, recorded))
+        stale = set(self.stale)
+        self.images = {(entry["path"], tuple(entry["size"]) if entry["size"] else None): entry
+                       for entry in index["images"] if entry["path"] not in stale}
+
+    def __len__(self):
+        return len(self.images)
+
+    def surface(self, path, size=None, alpha=True):
+        # The image as load_scaled would return it, or None if it has to be
+        # loaded from its file
+        entry = self.images.get((path, size))
+        if entry is None or (alpha and not entry["alpha"]):
+            return None
+        pixel_format = "RGBA" if entry["alpha"] else "RGB"
+        start = self.data + entry["offset"]
+        end = start + entry["width"] * entry["height"] * len(pixel_format)
+        return pygame.image.frombuffer(memoryview(self.map)[start:end], (entry["width"], entry["height"]), pixel_format)
+
+
+def open_pack(path):
+    # The pack at path, or None if there is none or it cannot be used; the
+    # game then loads the loose files as before
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        pack = AssetPack(path)
+    except (OSError, ValueError, KeyError, struct.error) as error:
+        logger.warning("Ignoring asset pack %s: %s", path, error)
+        return None
+    if pack.stale:
+        logger.warning("Asset pack %s is out of date for %s; loading those from their files. "
+                       "Rebuild it with python main.py --bake-assets", path, ", ".join(pack.stale))
+    return pack
+
+
+def bake(path):
+    # Build the pack of everything the game loads at startup
+    from . import startup_images
+
+    if pygame.display.get_surface() is None:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))  # For converting like the game does
+    return build_pack(path, startup_images())
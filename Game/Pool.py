@@ -0,0 +1,26 @@
+class EntityPool:
+    # Keeps released entities around and hands them out again on the next
+    # spawn, so spawning during play never allocates or touches assets.
+    # Pooled types provide reset(*args) to reinitialise their state.
+    def __init__(self, factory, prefill=0):
+        self.factory = factory  # Builds a new entity when the pool is empty
+        self.free = [factory() for _ in range(prefill)]
+        self.created = prefill
+        self.in_use = 0
+
+    def acquire(self, *args):
+        if self.free:
+            entity = self.free.pop()
+        else:
+            entity = self.factory()
+            self.created += 1
+        entity.reset(*args)
+        self.in_use += 1
+        return entity
+
+    def release(self, entity):
+        self.in_use -= 1
+        self.free.append(entity)
+
+    def occupancy(self):
+        return {"in_use": self.in_use, "free": len(self.free), "created": self.created}
@@ -0,0 +1,166 @@
+import csv
+import json
+import time
+from collections import deque
+
+import pygame
+
+from . Config import BLACK, GREEN, SCREEN_WIDTH, WHITE
+from . Text import text
+
+# Phases of one frame, in the order they run
+PHASES = ("events", "zombies", "player", "platforms", "coins", "scroll", "draw", "flip")
+SERIES = ("frame", "work") + PHASES
+
+
+def percentile(values, p):
+    # Nearest-rank percentile of already sorted values
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(p / 100 * len(values))) - 1))
+    return values[index]
+
+
+class NullProfiler:
+    # Stands in for FrameProfiler when profiling is off, so the frame loop
+    # pays for a few empty calls and nothing else
+    enabled = False
+
+    def begin(self):
+        pass
+
+    def lap(self, name):
+        pass
+
+    def end(self):
+        pass
+
+
+class FrameProfiler:
+    # Times every phase of every frame. The last `window` frames are kept
+    # for rolling percentiles and export, and a histogram of frame times
+    # covers the whole run.
+    enabled = True
+
+    def __init__(self, window=600, bucket_ms=1, buckets=50):
+        self.window = window
+        self.rows = deque(maxlen=window)  # (frame number, frame, work, *phases) in seconds
+        self.bucket_ms = bucket_ms
+        self.histogram = [0] * (buckets + 1)  # The last bucket counts everything slower
+        self.frames = 0
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.started = None  # Start of the current frame's work
+        self.last = None  # Time of the last lap
+        self.finished = None  # End of the previous frame
+
+    def begin(self):
+        self.started = self.last = time.perf_counter()
+        for name in self.current:
+            self.current[name] = 0.0
+
+    def lap(self, name):
+        # Charge the time since the last lap to phase `name`
+        now = time.perf_counter()
+        self.current[name] += now - self.last
+        self.last = now
+
+    def end(self):
+        now = time.perf_counter()
+        work = now - self.started
+        # Frame time runs from the end of one frame to the end of the next,
+        # so it includes waiting for the frame clock
+        frame = work if self.finished is None else now - self.finished
+        self.finished = now
+        self.frames += 1
+        self.rows.append((self.frames, frame, work) + tuple(self.current[name] for name in PHASES))
+        bucket = int(frame * 1000 / self.bucket_ms)
+        self.histogram[min(bucket, len(self.histogram) - 1)] += 1
+
+    def summary(self):
+        # Rolling statistics in milliseconds for every series
+        stats = {}
+        for column, name in enumerate(SERIES, start=1):
+            values = sorted(row[column] * 1000 for row in self.rows)
+            stats[name] = {
+                "mean": sum(values) / len(values) if values else 0.0,
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "max": values[-1] if values else 0.0,
+            }
+        return stats
+
+    def export(self, path):
+        # JSON gets everything; CSV gets the summary table and the histogram
+        summary = self.summary()
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["series", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"])
+                for name, stats in summary.items():
+                    writer.writerow([name] + [f"{stats[key]:.3f}" for key in ("mean", "p50", "p95", "p99", "max")])
+                writer.writerow([])
+                writer.writerow(["bucket_ms", "frames"])
+                for index, count in enumerate(self.histogram):
+                    low = index * self.bucket_ms
+                    label = f"{low}+" if index == len(self.histogram) - 1 else f"{low}-{low + self.bucket_ms}"
+                    writer.writerow([label, count])
+            return
+        data = {
+            "frames": self.frames,
+            "window": len(self.rows),
+            "summary": summary,
+            "histogram": {"bucket_ms": self.bucket_ms, "counts": self.histogram},
+            "samples": [dict(zip(("number",) + SERIES, row)) for row in self.rows],
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+
+class ProfilerOverlay(pygame.sprite.Sprite):
+    # HUD panel with the rolling percentiles of each phase and a frame-time
+    # histogram. It is re-rendered every `refresh` frames, not every frame.
+    def __init__(self, profiler, refresh=30, font_size=18):
+        super().__init__()
+        self.profiler = profiler
+        self.refresh = refresh
+        self.font = text.font(font_size)
+        self.rendered_at = None
+        self.image = pygame.Surface((1, 1), pygame.SRCALPHA)
+        self.rect = self.image.get_rect()
+
+    def update(self):
+        frames = self.profiler.frames
+        if self.rendered_at is not None and frames - self.rendered_at < self.refresh:
+            return
+        self.rendered_at = frames
+        summary = self.profiler.summary()
+        rows = [("ms", "p50", "p95", "p99", "max")]
+        for name in SERIES:
+            stats = summary[name]
+            rows.append((name,) + tuple(f"{stats[key]:.2f}" for key in ("p50", "p95", "p99", "max")))
+        # Names on the left, values right-aligned in fixed-width columns
+        column_width = 45
+        line_height = self.font.get_linesize()
+        histogram = self.profiler.histogram
+        width = max(80 + 4 * column_width, len(histogram) * 3) + 10
+        graph_height = 40
+        height = len(rows) * line_height + graph_height + 15
+
+        image = pygame.Surface((width, height), pygame.SRCALPHA)
+        image.fill(BLACK + (180,))
+        for i, row in enumerate(rows):
+            y = 5 + i * line_height
+            image.blit(self.font.render(row[0], True, WHITE), (5, y))
+            for column, value in enumerate(row[1:], start=1):
+                surface = self.font.render(value, True, WHITE)
+                image.blit(surface, surface.get_rect(topright=(80 + column * column_width, y)))
+        # One bar per bucket, scaled to the fullest bucket
+        tallest = max(histogram) or 1
+        bottom = height - 5
+        for i, count in enumerate(histogram):
+            bar = int(graph_height * count / tallest)
+            if bar:
+                pygame.draw.rect(image, GREEN, (5 + i * 3, bottom - bar, 2, bar))
+        self.image = image
+        self.rect = image.get_rect(topright=(SCREEN_WIDTH - 10, 10))
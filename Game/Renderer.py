@@ -0,0 +1,136 @@
+import weakref
+
+import pygame
+
+
+def merge_rects(rects):
+    # Union overlapping rects so no screen area gets redrawn twice
+    merged = []
+    for rect in rects:
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect = rect.union(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+def place(sprites, camera, offsets=None):
+    # (image, screen rect) of world-space sprites; offsets shift some of them
+    # to their interpolated positions. The rect is the image's size, not the
+    # sprite's, so redrawn areas cover everything the image draws.
+    left = -camera.x
+    offsets = offsets or {}
+    placed = []
+    for sprite in sprites:
+        image = sprite.image
+        x, y = sprite.rect.topleft
+        dx, dy = offsets.get(sprite, (0, 0))
+        placed.append((image, image.get_rect(topleft=(x + left + dx, y + dy))))
+    return placed
+
+
+class Scaler:
+    # Maps images and rects laid out for the 800x600 screen onto a canvas
+    # `scale` times that size. Scaled images are cached per source surface,
+    # so every animation frame is only scaled once; surfaces that are no
+    # longer used anywhere, like old score texts, drop out of the cache.
+    def __init__(self, scale):
+        self.scale = scale
+        self.images = weakref.WeakKeyDictionary()
+
+    def image(self, image):
+        scaled = self.images.get(image)
+        if scaled is None:
+            width, height = image.get_size()
+            size = (max(1, round(width * self.scale)), max(1, round(height * self.scale)))
+            if image.get_bitsize() in (24, 32):
+                scaled = pygame.transform.smoothscale(image, size)
+            else:
+                scaled = pygame.transform.scale(image, size)  # smoothscale only handles 24 and 32 bit surfaces
+            self.images[image] = scaled
+        return scaled
+
+    def place(self, placed):
+        scale = self.scale
+        result = []
+        for image, rect in placed:
+            image = self.image(image)
+            result.append((image, image.get_rect(topleft=(round(rect.x * scale), round(rect.y * scale)))))
+        return result
+
+
+class FullRenderer:
+    # Redraws the whole screen every frame. With a scale other than 1 the
+    # screen is a canvas of that size and sprites are drawn scaled.
+    def __init__(self, background, scale=1.0):
+        self.background = background  # Background layers, drawn first
+        self.scaler = Scaler(scale) if scale != 1 else None
+
+    def place(self, sprites, camera, offsets=None):
+        # Sprites live in world space and are shifted by the camera when drawn
+        placed = place(sprites, camera, offsets)
+        return placed if self.scaler is None else self.scaler.place(placed)
+
+    def place_hud(self, hud):
+        # HUD stays in screen space; text like the score grows past its rect
+        placed = [(sprite.image, sprite.image.get_rect(topleft=sprite.rect.topleft)) for sprite in hud]
+        return placed if self.scaler is None else self.scaler.place(placed)
+
+    def draw(self, screen, camera, sprites, hud, offsets=None):
+        # Returns the screen areas that changed, or None for the whole screen
+        self.background.draw(screen, camera)
+        screen.blits(self.place(sprites, camera, offsets), False)
+        screen.blits(self.place_hud(hud), False)
+        return None
+
+    def invalidate(self):
+        pass
+
+
+class DirtyRenderer(FullRenderer):
+    # Only redraws the screen areas whose sprites moved, changed frame,
+    # appeared or disappeared. Falls back to a full redraw when the camera
+    # scrolls, since then every pixel changes anyway.
+    def __init__(self, background, scale=1.0):
+        super().__init__(background, scale)
+        self.drawn = {}  # sprite -> (image, screen rect) as drawn last frame
+        self.camera_x = None
+
+    def invalidate(self):
+        # Something else drew over the screen; repaint everything next frame
+        self.camera_x = None
+
+    def draw(self, screen, camera, sprites, hud, offsets=None):
+        current = dict(zip(sprites, self.place(sprites, camera, offsets)))
+        current.update(zip(hud, self.place_hud(hud)))
+
+        if camera.x != self.camera_x:
+            self.camera_x = camera.x
+            self.drawn = current
+            self.background.draw(screen, camera)
+            screen.blits(list(current.values()), False)
+            return None
+
+        dirty = []
+        for sprite, (image, rect) in current.items():
+            previous = self.drawn.get(sprite)
+            if previous is None:
+                dirty.append(rect)
+            elif previous[0] is not image or previous[1] != rect:
+                dirty.append(previous[1])
+                dirty.append(rect)
+        for sprite, (image, rect) in self.drawn.items():
+            if sprite not in current:
+                dirty.append(rect)  # Removed since the last frame
+        self.drawn = current
+
+        screen_rect = screen.get_rect()
+        dirty = merge_rects([rect.clip(screen_rect) for rect in dirty if rect.colliderect(screen_rect)])
+        drawn = list(current.values())
+        for area in dirty:
+            screen.set_clip(area)
+            self.background.draw(screen, camera)
+            screen.blits([(image, rect) for image, rect in drawn if rect.colliderect(area)], False)
+        screen.set_clip(None)
+        return dirty
@@ -0,0 +1,144 @@
+import json
+import os
+
+import pygame
+
+from . Input import KeyState
+
+# Keys the game reads; each tick is stored as a bit mask of them
+TRACKED_KEYS = (pygame.K_a, pygame.K_d, pygame.K_w)
+KEY_STATES = [KeyState(key for bit, key in enumerate(TRACKED_KEYS) if mask & 1 << bit)
+              for mask in range(1 << len(TRACKED_KEYS))]
+FORMAT_VERSION = 1
+
+
+def encode_runs(runs):
+    # [(mask, count), ...] -> "2x120,6,2x45": mask digit, then "x" and the
+    # count for runs longer than one tick
+    return ",".join(f"{mask}x{count}" if count > 1 else str(mask) for mask, count in runs)
+
+
+def decode_runs(data):
+    runs = []
+    for run in data.split(",") if data else ():
+        mask, _, count = run.partition("x")
+        runs.append((int(mask), int(count or 1)))
+    return runs
+
+
+class RecordingInput:
+    # Wraps an input source and run-length encodes the tracked keys of every
+    # tick. The game only sees the tracked keys, so a replay sees exactly
+    # what the round saw.
+    def __init__(self, source):
+        self.source = source
+        self.runs = []  # [mask, count]
+        self.ticks = 0
+
+    def get_pressed(self):
+        keys = self.source.get_pressed()
+        mask = 0
+        for bit, key in enumerate(TRACKED_KEYS):
+            if keys[key]:
+                mask |= 1 << bit
+        if self.runs and self.runs[-1][0] == mask:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([mask, 1])
+        self.ticks += 1
+        return KEY_STATES[mask]
+
+
+class ReplayInput:
+    # Plays back decoded runs one tick at a time
+    def __init__(self, runs):
+        self.runs = runs
+        self.run = 0
+        self.left = runs[0][1] if runs else 0
+
+    def get_pressed(self):
+        while self.left == 0:
+            self.run += 1
+            if self.run >= len(self.runs):
+                return KEY_STATES[0]
+            self.left = self.runs[self.run][1]
+        self.left -= 1
+        return KEY_STATES[self.runs[self.run][0]]
+
+
+def save_recording(path, game, recorder):
+    # Seed, level options, input runs and the outcome the replay must match
+    data = {
+        "version": FORMAT_VERSION,
+        "seed": game.seed,
+        "endless": game.endless,
+        "zombie_system": game.zombie_system,
+        "offscreen_zombies": game.offscreen_zombies,
+        "ticks": recorder.ticks,
+        "score": game.score.score,
+        "result": game.result,
+        "keys": encode_runs(recorder.runs),
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+
+
+def prune_recordings(directory, keep, referenced=()):
+    # Delete all but the `keep` newest recordings in directory. Recordings
+    # in `referenced` (e.g. those of high-score entries) are never deleted
+    # and do not count towards `keep`. Returns the deleted paths.
+    if keep is None or not os.path.isdir(directory):
+        return []
+    referenced = {os.path.normpath(path) for path in referenced}
+    paths = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".replay")]
+    paths = [path for path in paths if os.path.normpath(path) not in referenced]
+    paths.sort(key=os.path.getmtime, reverse=True)
+    deleted = []
+    for path in paths[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            continue  # Already gone, e.g. pruned by another game
+        deleted.append(path)
+    return deleted
+
+
+def load_recording(path):
+    with open(path) as f:
+        data = json.load(f)
+    if data.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported recording version {data.get('version')!r} in {path}")
+    return data
+
+
+def replay(path):
+    # Re-run a recorded round headless and as fast as possible. Returns
+    # (matches, recording, snapshot), where matches is True when the replay
+    # ends on the recorded tick with the recorded score and result.
+    from . import Game
+
+    recording = load_recording(path)
+    game = Game(headless=True, seed=recording["seed"], input_source=ReplayInput(decode_runs(recording["keys"])),
+                zombie_system=recording["zombie_system"], endless=recording["endless"], record=None,
+                offscreen_zombies=recording.get("offscreen_zombies", "update"))
+    game.step(recording["ticks"])
+    snapshot = game.snapshot()
+    matches = (snapshot["ticks"] == recording["ticks"] and snapshot["score"] == recording["score"]
+               and snapshot["result"] == recording["result"])
+    return matches, recording, snapshot
+
+
+def verify(paths):
+    # Replay every recording and print whether it matches; returns the
+    # number of mismatches
+    failed = 0
+    for path in paths:
+        matches, recording, snapshot = replay(path)
+        status = "ok" if matches else "MISMATCH"
+        print(f"{path}: {status} recorded score {recording['score']} at tick {recording['ticks']}, "
+              f"replayed score {snapshot['score']} at tick {snapshot['ticks']}")
+        failed += not matches
+    return failed
@@ -0,0 +1,228 @@
+import time
+
+import pygame
+
+from . Config import BLACK, FPS, GREEN, IDLE_FPS, MESSAGE_MS, RED, WHITE
+from . Text import text
+
+
+class Scene:
+    # One screen of the game. Game.run calls frame() once per pass of its
+    # paced main loop with that frame's events and the milliseconds since
+    # the last frame, so no scene ever blocks, sleeps or busy-waits. Static
+    # scenes run at IDLE_FPS and only redraw when something changed. Layouts
+    # are for the 800x600 screen and get scaled to the canvas.
+    fps = IDLE_FPS
+
+    def __init__(self, game):
+        self.game = game
+        self.needs_draw = True
+
+    def enter(self):
+        pass
+
+    def frame(self, events, elapsed):
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.game.running = False
+            elif event.type == pygame.WINDOWEXPOSED:
+                self.needs_draw = True  # Uncovered by another window
+            else:
+                self.handle_event(event)
+        self.update(elapsed)
+        if self.needs_draw and self.game.scene is self:
+            self.needs_draw = False
+            self.draw(self.game.screen)
+            self.game.display.present()
+            self.game.frame_presented()
+
+    def handle_event(self, event):
+        pass
+
+    def update(self, elapsed):
+        pass
+
+    def draw(self, screen):
+        pass
+
+    def scaled(self, value):
+        return round(value * self.game.display.scale)
+
+    def render(self, string, color, size):
+        return text.render(string, color, max(1, self.scaled(size)))
+
+    def blit_centered(self, screen, surface, dy=0):
+        center = screen.get_rect().center
+        screen.blit(surface, surface.get_rect(center=(center[0], center[1] + self.scaled(dy))))
+
+
+class TimedScene(Scene):
+    # Shown for MESSAGE_MS, then followed by the scene next() returns
+    duration = MESSAGE_MS
+
+    def enter(self):
+        super().enter()
+        self.remaining = self.duration
+
+    def update(self, elapsed):
+        super().update(elapsed)
+        self.remaining -= elapsed
+        if self.remaining <= 0:
+            self.game.switch(self.next())
+
+    def next(self):
+        return HighscoresScene(self.game)
+
+
+class LoadingScene(Scene):
+    # Progress bar while the preloader decodes the sprites
+    fps = FPS
+
+    def update(self, elapsed):
+        game = self.game
+        game.preloader.pump()
+        if game.preloader.done:
+            game.finish_loading()
+            game.switch(MenuScene(game))
+        self.needs_draw = True
+
+    def draw(self, screen):
+        screen.fill(BLACK)
+        self.blit_centered(screen, self.render("LOADING...", WHITE, 55), -30)
+        area = screen.get_rect()
+        bar = pygame.Rect(0, 0, area.width // 2, self.scaled(20))
+        bar.center = (area.centerx, area.centery + self.scaled(20))
+        pygame.draw.rect(screen, WHITE, bar, max(1, self.scaled(2)))
+        pygame.draw.rect(screen, WHITE, (bar.x, bar.y, int(bar.width * self.game.preloader.progress), bar.height))
+        self.game.frames_drawn += 1
+
+
+class BackdropScene(Scene):
+    # Message over a blurred copy of the last game frame. With a threaded
+    # blur the plain frame stays up until the blur is ready.
+    def enter(self):
+        super().enter()
+        game = self.game
+        game.renderer.invalidate()  # The scene draws over the last game frame
+        self.key = game.frames_drawn
+        game.backdrop.request(game.screen, self.key)
+        self.waiting = True  # For the blur; the last frame stays on screen meanwhile
+        self.needs_draw = False
+
+    def update(self, elapsed):
+        if self.waiting and self.game.backdrop.ready(self.key):
+            self.waiting = False
+            self.needs_draw = True
+        super().update(elapsed)
+
+    def draw(self, screen):
+        self.game.blur_backdrop()
+        self.draw_message(screen)
+
+    def draw_message(self, screen):
+        pass
+
+
+class MenuScene(BackdropScene):
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:  # Press Enter to start the game
+            self.game.switch(PlayingScene(self.game))
+
+    def draw_message(self, screen):
+        self.blit_centered(screen, self.render("URBAN ZOMBIE WARRIOR", WHITE, 74), -50)
+        self.blit_centered(screen, self.render("PRESS ENTER TO CONTINUE", WHITE, 55))
+
+
+class PlayingScene(Scene):
+    # Simulates whole fixed ticks for the time that passed and draws the
+    # state in between the last two of them. With adaptive resolution the
+    # time the frame took picks the render scale.
+    fps = FPS
+
+    def enter(self):
+        self.game.timestep.reset()  # Time spent in earlier scenes is not played
+
+    def frame(self, events, elapsed):
+        game = self.game
+        started = time.perf_counter()
+        game.profiler.begin()
+        for event in events:
+            game.handle_event(event)
+        game.profiler.lap("events")
+        for _ in range(game.timestep.advance(elapsed)):
+            if not game.running or game.result is not None:
+                break
+            game.update()
+        drawing = time.perf_counter()
+        if game.running:
+            game.draw(game.timestep.alpha)
+        game.profiler.end()
+        if game.resolution is not None:
+            finished = time.perf_counter()
+            scale = game.resolution.frame((finished - started) * 1000, (finished - drawing) * 1000)
+            if scale is not None:
+                game.set_render_scale(scale)
+        if game.result == "dead":
+            game.switch(DeathScene(game))
+        elif game.result == "won":
+            game.switch(WinScene(game))
+
+
+class DeathScene(TimedScene, BackdropScene):
+    def draw_message(self, screen):
+        self.blit_centered(screen, self.render(f"WASTED Score:{self.game.score.score}", RED, 55))
+
+
+class WinScene(TimedScene, BackdropScene):
+    def draw_message(self, screen):
+        self.blit_centered(screen, self.render(f"YOU WIN Score:{self.game.score.score}", GREEN, 55))
+
+    def next(self):
+        if self.game.check_for_highscore():
+            return NameEntryScene(self.game)
+        return super().next()
+
+
+class NameEntryScene(Scene):
+    def enter(self):
+        self.player_name = ""
+
+    def handle_event(self, event):
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key == pygame.K_RETURN:
+            if self.player_name.strip():  # Ensure player_name is not empty
+                # Add the new high score; it is written to disk in the background
+                game = self.game
+                game.highscores.add(self.player_name, game.score.score, replay=game.recording_path)
+                game.switch(HighscoresScene(game))
+                return
+            self.player_name = "Anonymous"  # Default to "Anonymous" if no name is provided
+        elif event.key == pygame.K_BACKSPACE:
+            self.player_name = self.player_name[:-1]
+        else:
+            self.player_name += event.unicode
+        self.needs_draw = True
+
+    def draw(self, screen):
+        screen.fill(WHITE)
+        self.blit_centered(screen, self.render("Enter your name:", GREEN, 55), -50)
+        self.blit_centered(screen, self.render(self.player_name, GREEN, 55))
+
+
+class HighscoresScene(TimedScene):
+    # The table is shown for MESSAGE_MS, then the game ends
+    def enter(self):
+        super().enter()
+        self.game.highscores.refresh()  # Pick up scores from other instances
+
+    def draw(self, screen):
+        screen.fill(BLACK)
+        screen.blit(self.render("High Scores", WHITE, 36), (self.scaled(50), self.scaled(50)))
+        for i, (name, score) in enumerate(self.game.highscores.top()):
+            screen.blit(self.render(f"{i+1}. {name} - {score}", WHITE, 36), (self.scaled(50), self.scaled(100 + i * 30)))
+
+    def update(self, elapsed):
+        self.remaining -= elapsed
+        if self.remaining <= 0:
+            self.game.running = False  # The round is over
@@ -0,0 +1,84 @@
+class SpatialHash:
+    # Uniform grid broadphase. Entities (anything with a rect) are registered in
+    # every cell their rect overlaps and re-bucketed only when they change cell,
+    # so a query only touches the entities near the queried rect.
+    # Query results come back in insertion order, the order a linear scan of
+    # the entity list would have visited them in.
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.entity_cells = {}  # entity -> cell bounds it is registered in
+        self.sequence = {}  # entity -> insertion number
+        self.inserted = 0
+
+    def __len__(self):
+        return len(self.entity_cells)
+
+    def __contains__(self, entity):
+        return entity in self.entity_cells
+
+    def bounds(self, rect):
+        # Inclusive range of cells covered by rect, as (left, top, right, bottom)
+        size = self.cell_size
+        return (rect.left // size, rect.top // size, (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def cells_for(self, rect):
+        left, top, right, bottom = self.bounds(rect)
+        return [(cx, cy) for cx in range(left, right + 1) for cy in range(top, bottom + 1)]
+
+    def insert(self, entity, rect=None):
+        # rect files the entity under another area than its own rect, e.g.
+        # everywhere it can move to; such entities must not be move()d
+        self.sequence[entity] = self.inserted
+        self.inserted += 1
+        self._add(entity, rect)
+
+    def _add(self, entity, rect=None):
+        bounds = self.bounds(entity.rect if rect is None else rect)
+        left, top, right, bottom = bounds
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                cell = self.cells.get((cx, cy))
+                if cell is None:
+                    cell = self.cells[(cx, cy)] = {}
+                cell[entity] = None
+        self.entity_cells[entity] = bounds
+
+    def remove(self, entity):
+        self.sequence.pop(entity, None)
+        self._discard(entity)
+
+    def _discard(self, entity):
+        bounds = self.entity_cells.pop(entity, None)
+        if bounds is None:
+            return
+        left, top, right, bottom = bounds
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                cell = self.cells[(cx, cy)]
+                del cell[entity]
+                if not cell:
+                    del self.cells[(cx, cy)]
+
+    def move(self, entity):
+        # Call after the entity's rect changed; cheap when it stayed in its cells
+        if self.entity_cells.get(entity) != self.bounds(entity.rect):
+            self._discard(entity)
+            self._add(entity)
+
+    def query(self, rect):
+        # Candidates overlapping the cells of rect, as a new list so callers may
+        # remove entities while iterating over the result
+        found = {}
+        for key in self.cells_for(rect):
+            cell = self.cells.get(key)
+            if cell:
+                found.update(cell)
+        if len(found) > 1:
+            return sorted(found, key=self.sequence.__getitem__)
+        return list(found)
+
+    def clear(self):
+        self.cells.clear()
+        self.entity_cells.clear()
+        self.sequence.clear()
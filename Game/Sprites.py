@@ -1,30 +1,38 @@
 import pygame
 
+from . Assets import assets
 from . Config import SCREEN_HEIGHT, WHITE, BLACK
+from . Text import text
+
+# Animation frames as (path pattern, frame count, scaled size)
+PLAYER_JUMP_FRAMES = ('Game/static/animation/player/mario_jump{}.png', 1, (40, 64))
+PLAYER_RUN_FRAMES = ('Game/static/animation/player/mario_run{}.png', 4, (40, 64))
+ZOMBIE_WALK_FRAMES = ('Game/static/animation/zombie/zombie_walk{}.png', 2, (64, 64))
+COIN_FRAMES = ('Game/static/animation/goldCoin/goldCoin{}.png', 8, (32, 32))
+ANIMATIONS = (PLAYER_JUMP_FRAMES, PLAYER_RUN_FRAMES, ZOMBIE_WALK_FRAMES, COIN_FRAMES)
 
 
 class Score(pygame.sprite.Sprite):
     def __init__(self, x, y):
         super().__init__()
         self.score = 0
-        self.font = pygame.font.SysFont(None, 55)  # Moved the font initialization here
-        self.image = self.font.render(f"Score: {self.score}", True, WHITE)
+        self.digits = text.digits(55, WHITE)  # Score changes only blit pre-rendered digits
+        self.image = self.digits.render(self.score, "Score: ")
         self.rect = self.image.get_rect()
         self.rect.topleft = (x, y)
 
     def increase_score(self, amount):
         self.score += amount
-        self.image = self.font.render(f"Score: {self.score}", True, WHITE)
+        self.image = self.digits.render(self.score, "Score: ")
         
 class Player(pygame.sprite.Sprite):
-    def __init__(self, x, y):
+    def __init__(self, x, y, clock):
         super().__init__()
-        # Load movement images
-        self.jump_images = [pygame.transform.scale(pygame.image.load(f'Game/static/animation/player/mario_jump{i}.png'),(40,64)) for i in range(1) ]
-        self.images = [pygame.transform.scale(pygame.image.load(f'Game/static/animation/player/mario_run{i}.png'),(40,64)) for i in range(4)]
-        self.index = 0
-        self.jump_index = 0
-        self.image = self.images[self.index]
+        # Shared movement frame tables
+        self.jump_frames = assets.animation(*PLAYER_JUMP_FRAMES)
+        self.run_frames = assets.animation(*PLAYER_RUN_FRAMES)
+        self.clock = clock  # Shared animation clock
+        self.image = self.run_frames.right[0]
         self.rect = self.image.get_rect()
         self.rect.topleft = (x, y)
         # Player movement properties
@@ -36,10 +44,6 @@ class Player(pygame.sprite.Sprite):
         self.fall_gravity = 0.25
         self.on_ground = True
         self.jump_pressed = False  # Flag to avoid holding jump
-        # Animation properties
-        self.animation_timer = 0  # Timer for frame updating
-        self.animation_speed = 150  # Milliseconds for each frame
-        self.last_update = pygame.time.get_ticks()  # Last update time
 
     def update(self, keys):
         # Handle horizontal movement
@@ -76,45 +80,34 @@ class Player(pygame.sprite.Sprite):
         self.animate()
 
     def animate(self):
-        current_time = pygame.time.get_ticks()
-        # Check if it's time to update the frame
-        if current_time - self.last_update > self.animation_speed:
-            self.last_update = current_time
-            
-            # Update the frame index based on velocity and state
-            if self.on_ground == False:  # If jumping up
-                self.index = (self.index + 1) % len(self.jump_images)  # Loop through jump images
-                self.image = self.jump_images[self.index]
-            elif self.velocity.x != 0:  # If moving horizontally
-                self.index = (self.index + 1) % len(self.images)  # Loop through run images
-                self.image = self.images[self.index]
-            else:  # If not moving horizontally and on the ground
-                self.index = 0
-                self.image = self.images[self.index]
-
-            # Flip the image based on the direction of movement
-            if self.velocity.x < 0:  # Moving left
-                self.image = pygame.transform.flip(self.images[self.index], True, False)  # Flip horizontally
-            elif self.velocity.x > 0:  # Moving right
-                self.image = self.images[self.index]  # Original image
+        # Pick the frame from the precomputed tables, mirrored when moving left
+        facing_left = self.velocity.x < 0
+        if not self.on_ground:  # If jumping up
+            self.image = self.jump_frames.frame(self.clock.frame, facing_left)
+        elif self.velocity.x != 0:  # If moving horizontally
+            self.image = self.run_frames.frame(self.clock.frame, facing_left)
+        else:  # If not moving horizontally and on the ground
+            self.image = self.run_frames.right[0]
 
 class Zombie(pygame.sprite.Sprite):
-    def __init__(self, x, y):
+    # Zombies are pooled and reused; reset() puts one back into the state of
+    # a fresh spawn
+
+    def __init__(self, x, y, clock):
         super().__init__()
-        self.images = [pygame.transform.scale(pygame.image.load(f'Game/static/animation/zombie/zombie_walk{i}.png'),(64,64)) for i in range(2)]
-        self.index = 0
-        self.image = self.images[self.index]
-        self.rect = self.image.get_rect()
+        self.frames = assets.animation(*ZOMBIE_WALK_FRAMES)
+        self.clock = clock  # Shared animation clock
+        self.rect = self.frames.right[0].get_rect()
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        self.image = self.frames.right[0]
         self.rect.topleft = (x, y)
         self.velocity = 2.5  # Speed of the zombie
         self.move_direction = 1
         self.boundary_left = x - 250  # Left boundary
         self.boundary_right = x + 50  # Right boundary
-        # Animation properties
-        self.animation_timer = 0  # Timer for frame updating
-        self.animation_speed = 150  # Milliseconds for each frame
-        self.last_update = pygame.time.get_ticks()  # Last update time
-    
+
     def update(self):
         # Move back and forth
         self.rect.x += self.velocity * self.move_direction
@@ -126,33 +119,45 @@ class Zombie(pygame.sprite.Sprite):
         elif self.rect.x >= self.boundary_right:  # Check right boundary
             self.rect.x = self.boundary_right  # Snap to boundary
             self.move_direction = -1  # Move left after hitting right boundary
-            
-        # Flip the image based on the direction of movement
-        if self.move_direction >= 0:  # Moving left
-            self.image = pygame.transform.flip(self.image, True, False)  # Flip horizontally
-        else:  # Moving right
-            self.image = self.image  # Use the original image
-            
+
         self.animate()
         
     def animate(self):
-            current_time = pygame.time.get_ticks()
-            # Check if it's time to update the frame
-            if current_time - self.last_update > self.animation_speed:
-                self.last_update = current_time
-
-            # Update the frame index regardless of velocity to constantly animate zombie walk
-                self.index = (self.index + 1) % len(self.images)
-                self.image = self.images[self.index]    
-
-            # Flip the image based on the direction of movement
-            if self.move_direction == -1:  # Moving left
-                self.image = pygame.transform.flip(self.images[self.index], True, False)  # Flip horizontally
-            else:  # Moving right
-                self.image = self.images[self.index]  # Use the original image
-                            
-            
-            
+        # Walk cycle from the shared clock, mirrored when moving left
+        self.image = self.frames.frame(self.clock.frame, self.move_direction == -1)
+
+    def patrol_range(self):
+        # Everywhere the zombie can be while it patrols
+        return pygame.Rect(self.boundary_left, self.rect.y,
+                           self.boundary_right - self.boundary_left + self.rect.width, self.rect.height)
+
+    def fast_forward(self, ticks):
+        # Move as `ticks` calls of update() would, without animating. The
+        # patrol is periodic, so only up to about two laps are simulated.
+        x = self.rect.x
+        direction = self.move_direction
+        seen = {}
+        while ticks > 0:
+            state = (x, direction)
+            if seen is not None:
+                if state in seen:
+                    ticks %= seen[state] - ticks  # Skip whole laps
+                    seen = None
+                    continue
+                seen[state] = ticks
+            # Same rounding as assigning the float to rect.x
+            moved = x + self.velocity * direction
+            x = int(moved + 0.5) if moved >= 0 else -int(-moved + 0.5)
+            if x <= self.boundary_left:
+                x = self.boundary_left
+                direction = 1
+            elif x >= self.boundary_right:
+                x = self.boundary_right
+                direction = -1
+            ticks -= 1
+        self.rect.x = x
+        self.move_direction = direction
+
 
 class Platform(pygame.sprite.Sprite):
     def __init__(self, x, y, width, height):
@@ -165,29 +170,19 @@ class Platform(pygame.sprite.Sprite):
         self.rect.topleft = (x, y)
         
 class Coin(pygame.sprite.Sprite):
-    def __init__(self, x, y):
+    # Coins are pooled and reused. Their frame comes straight from the shared
+    # clock, so they never need animating.
+
+    def __init__(self, x, y, clock):
         super().__init__()
-        self.images = [pygame.transform.scale(pygame.image.load(f'Game/static/animation/goldCoin/goldCoin{i}.png'),(32,32)) for i in range(8)]
-        self.index = 0
-        self.image = self.images[self.index]
-        self.rect = self.image.get_rect()
+        self.frames = assets.animation(*COIN_FRAMES)
+        self.clock = clock  # Shared animation clock
+        self.rect = self.frames.right[0].get_rect()
+        self.reset(x, y)
+
+    def reset(self, x, y):
         self.rect.topleft = (x, y)
-        self.collected = False  # Flag to check if the coin has been collected
-         # Animation properties
-        self.animation_timer = 0  # Timer for frame updating
-        self.animation_speed = 150  # Milliseconds for each frame
-        self.last_update = pygame.time.get_ticks()  # Last update time
-        
-    def animate(self):
-        current_time = pygame.time.get_ticks()
-        # Check if it's time to update the frame
-        if current_time - self.last_update > self.animation_speed:
-            self.last_update = current_time
-            
-        # Update the frame index regardless of velocity to constantly animate zombie walk
-            self.index = (self.index + 1) % len(self.images)
-            self.image = self.images[self.index]    
-        
-                            
-        
 
+    @property
+    def image(self):
+        return self.frames.frame(self.clock.frame)
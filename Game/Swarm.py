@@ -0,0 +1,134 @@
+import numpy as np
+import pygame
+
+from . Assets import assets
+from . Sprites import ZOMBIE_WALK_FRAMES
+
+
+def round_half_away(values):
+    # Rounds like assigning a float to a pygame.Rect attribute
+    return np.copysign(np.floor(np.abs(values) + 0.5), values)
+
+
+class ZombieSwarm:
+    # Struct-of-arrays zombie simulation. Positions, speeds, directions and
+    # patrol bounds live in NumPy arrays and every zombie is stepped at once,
+    # with the same movement rules as Zombie.update. Slots of killed zombies
+    # are reused by later spawns.
+    def __init__(self, clock, capacity=64):
+        self.clock = clock  # Shared animation clock
+        self.frames = assets.animation(*ZOMBIE_WALK_FRAMES)
+        self.width, self.height = self.frames.right[0].get_size()
+        self.x = np.zeros(capacity, dtype=np.int64)
+        self.y = np.zeros(capacity, dtype=np.int64)
+        self.velocity = np.zeros(capacity, dtype=np.float64)
+        self.direction = np.zeros(capacity, dtype=np.int64)
+        self.boundary_left = np.zeros(capacity, dtype=np.int64)
+        self.boundary_right = np.zeros(capacity, dtype=np.int64)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.serial = np.zeros(capacity, dtype=np.int64)  # Spawn order, for stable collision order
+        self.spawned = 0
+        self.free = list(range(capacity - 1, -1, -1))  # Unused slots, lowest last
+        self.sprites = {}  # slot -> SwarmZombie view, reused when the slot respawns
+
+    def __len__(self):
+        return int(self.active.sum())
+
+    def _grow(self):
+        capacity = len(self.active)
+        for name in ("x", "y", "velocity", "direction", "boundary_left", "boundary_right", "active", "serial"):
+            array = getattr(self, name)
+            setattr(self, name, np.concatenate([array, np.zeros(capacity, dtype=array.dtype)]))
+        self.free = list(range(2 * capacity - 1, capacity - 1, -1)) + self.free
+
+    def spawn(self, x, y, velocity=2.5):
+        if not self.free:
+            self._grow()
+        index = self.free.pop()
+        self.x[index] = x
+        self.y[index] = y
+        self.velocity[index] = velocity  # Speed of the zombie
+        self.direction[index] = 1
+        self.boundary_left[index] = x - 250  # Left boundary
+        self.boundary_right[index] = x + 50  # Right boundary
+        self.active[index] = True
+        self.serial[index] = self.spawned
+        self.spawned += 1
+        return index
+
+    def kill(self, index):
+        if self.active[index]:
+            self.active[index] = False
+            self.free.append(index)
+
+    def add(self, x, y):
+        # Spawn a zombie and return a sprite view of it
+        index = self.spawn(x, y)
+        sprite = self.sprites.get(index)
+        if sprite is None:
+            sprite = self.sprites[index] = SwarmZombie(self, index)
+        return sprite
+
+    def remove(self, sprite):
+        self.kill(sprite.index)
+
+    def occupancy(self):
+        return {"in_use": len(self), "free": len(self.free), "created": len(self.sprites)}
+
+    def update(self):
+        # Move back and forth, reversing at the patrol boundaries
+        active = self.active
+        x = np.where(active, round_half_away(self.x + self.velocity * self.direction), self.x).astype(np.int64)
+        hit_left = active & (x <= self.boundary_left)
+        hit_right = active & ~hit_left & (x >= self.boundary_right)
+        x[hit_left] = self.boundary_left[hit_left]  # Snap to boundary
+        x[hit_right] = self.boundary_right[hit_right]
+        self.direction[hit_left] = 1
+        self.direction[hit_right] = -1
+        self.x = x
+
+    def colliding(self, rect):
+        # Indices of active zombies whose rect overlaps rect, in spawn order
+        hits = np.flatnonzero(self.active
+                              & (self.x < rect.right) & (self.x + self.width > rect.left)
+                              & (self.y < rect.bottom) & (self.y + self.height > rect.top))
+        if len(hits) > 1:
+            hits = hits[np.argsort(self.serial[hits])]
+        return hits.tolist()
+
+    def query(self, rect):
+        # Sprite views of the zombies overlapping rect, in spawn order
+        return [self.sprites[index] for index in self.colliding(rect)]
+
+    def rect(self, index):
+        return pygame.Rect(int(self.x[index]), int(self.y[index]), self.width, self.height)
+
+    def rects(self):
+        return [self.rect(index) for index in np.flatnonzero(self.active)]
+
+    def image(self, index):
+        return self.frames.frame(self.clock.frame, self.direction[index] == -1)
+
+
+class SwarmZombie(pygame.sprite.Sprite):
+    # Sprite view of one swarm slot, so swarm zombies can be drawn and
+    # collision-checked like regular Zombie sprites
+    def __init__(self, swarm, index):
+        super().__init__()
+        self.swarm = swarm
+        self.index = index
+
+    @property
+    def rect(self):
+        return self.swarm.rect(self.index)
+
+    @property
+    def image(self):
+        return self.swarm.image(self.index)
+
+    @property
+    def move_direction(self):
+        return int(self.swarm.direction[self.index])
+
+    def update(self):
+        pass  # Stepped in bulk by ZombieSwarm.update
@@ -0,0 +1,194 @@
+import json
+import logging
+import os
+import socket
+import struct
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Event types; each event is stored as its index in this tuple
+KINDS = ("round", "coin", "stomp", "spawn", "death", "win", "lost")
+CODES = {kind: code for code, kind in enumerate(KINDS)}
+# Round, tick, kind, x, y, value. "round" events carry the seed as value,
+# "lost" events the number of events dropped before them, the others the
+# score after the event.
+RECORD = struct.Struct("<IIBiiq")
+FORMATS = ("jsonl", "binary")
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest")
+MAGIC = b"UZWT"  # Start of binary files, followed by the JSON header line
+FORMAT_VERSION = 1
+
+
+class NullTelemetry:
+    # Stand-in when telemetry is off, so the game can record unconditionally
+    enabled = False
+
+    def start_round(self, seed):
+        pass
+
+    def emit(self, kind, tick, x=0, y=0, value=0):
+        pass
+
+    def close(self):
+        pass
+
+
+class Telemetry:
+    # Gameplay events, stamped with their round and tick, go into a ring
+    # buffer of `capacity` preallocated records. A background thread takes
+    # them out in batches every `interval` seconds (sooner when the buffer
+    # is half full or a round ends) and appends them to files in `directory`,
+    # starting a new file once one reaches `max_bytes`. The frame loop only
+    # packs records into memory and never waits on disk.
+    #
+    # Loss is bounded by the buffer: if the writer falls behind and the ring
+    # is full, "drop_oldest" overwrites the oldest unwritten event and
+    # "drop_newest" discards the incoming one. Either way the number of lost
+    # events is written out as a "lost" event in their place.
+    enabled = True
+
+    def __init__(self, directory, file_format="jsonl", capacity=4096, overflow="drop_oldest",
+                 max_bytes=1 << 20, interval=1.0):
+        if file_format not in FORMATS:
+            raise ValueError(f"Unknown telemetry format {file_format!r}")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown telemetry overflow policy {overflow!r}")
+        self.directory = directory
+        self.format = file_format
+        self.capacity = capacity
+        self.overflow = overflow
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.buffer = bytearray(capacity * RECORD.size)
+        self.head = 0  # Events ever emitted into the ring
+        self.tail = 0  # Events taken out by the writer
+        self.dropped = 0  # Events lost since the writer last looked
+        self.lost = 0  # Events lost in total
+        self.round = 0
+        self.tick = 0  # Tick of the last event, for "lost" events
+        self.lock = threading.Lock()  # Only held to move records, never during I/O
+        self.wake = threading.Event()
+        self.stopping = False
+
+        self.host = socket.gethostname()
+        self.session = f"{time.strftime('%Y%m%d-%H%M%S')}-{self.host}-{os.getpid()}"
+        self.part = 0
+        self.file = None
+        self.writer = threading.Thread(target=self._write_loop, name="telemetry-writer", daemon=True)
+        self.writer.start()
+
+    def start_round(self, seed):
+        self.round += 1
+        self.emit("round", 0, value=seed)
+
+    def emit(self, kind, tick, x=0, y=0, value=0):
+        with self.lock:
+            if self.head - self.tail == self.capacity:
+                self.dropped += 1
+                if self.overflow == "drop_newest":
+                    return
+                self.tail += 1  # Overwrite the oldest event
+            RECORD.pack_into(self.buffer, self.head % self.capacity * RECORD.size,
+                             self.round, tick, CODES[kind], x, y, value)
+            self.head += 1
+            self.tick = tick
+            pending = self.head - self.tail
+        if pending == self.capacity // 2 or kind in ("death", "win"):
+            self.wake.set()
+
+    def take(self):
+        # Packed records emitted since the last call, oldest first
+        with self.lock:
+            start = self.tail % self.capacity * RECORD.size
+            end = self.head % self.capacity * RECORD.size
+            if self.head == self.tail:
+                data = b""
+            elif start < end:
+                data = bytes(self.buffer[start:end])
+            else:
+                data = bytes(self.buffer[start:]) + bytes(self.buffer[:end])
+            self.tail = self.head
+            dropped, self.dropped = self.dropped, 0
+            tick = self.tick
+        if dropped:
+            self.lost += dropped
+            # Lost events are reported ahead of the batch they were lost from
+            data = RECORD.pack(self.round, tick, CODES["lost"], 0, 0, dropped) + data
+        return data
+
+    def _write_loop(self):
+        while True:
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            stopping = self.stopping
+            data = self.take()
+            if data:
+                try:
+                    self._write(data)
+                except OSError:
+                    # E.g. a full disk; the batch is lost but the game goes on
+                    self.lost += len(data) // RECORD.size
+                    logger.exception("Could not write telemetry to %s", self.directory)
+                    self._close_file()
+            if stopping:
+                self._close_file()
+                return
+
+    def _write(self, data):
+        if self.file is None:
+            self._open_file()
+        if self.format == "binary":
+            self.file.write(data)
+        else:
+            lines = []
+            for round_number, tick, code, x, y, value in RECORD.iter_unpack(data):
+                lines.append(json.dumps({"round": round_number, "tick": tick, "event": KINDS[code],
+                                         "x": x, "y": y, "value": value}))
+            self.file.write(("\n".join(lines) + "\n").encode("utf-8"))
+        self.file.flush()
+        if self.file.tell() >= self.max_bytes:
+            self._close_file()  # The next batch starts a new file
+
+    def _open_file(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self.part += 1
+        extension = "bin" if self.format == "binary" else "jsonl"
+        path = os.path.join(self.directory, f"{self.session}-{self.part:04d}.{extension}")
+        self.file = open(path, "wb")
+        header = {"telemetry": FORMAT_VERSION, "session": self.session, "host": self.host, "part": self.part}
+        if self.format == "binary":
+            header["record"] = RECORD.format
+            self.file.write(MAGIC)
+        self.file.write(json.dumps(header).encode("utf-8") + b"\n")
+
+    def _close_file(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def close(self):
+        # Write out everything still buffered and stop the writer
+        if self.stopping:
+            return
+        self.stopping = True
+        self.wake.set()
+        self.writer.join()
+
+
+def read_events(path):
+    # (header, events) of a telemetry file of either format; events are
+    # dicts like the lines of a JSONL file
+    with open(path, "rb") as f:
+        binary = f.read(len(MAGIC)) == MAGIC
+        if not binary:
+            f.seek(0)
+        header = json.loads(f.readline())
+        if not binary:
+            return header, [json.loads(line) for line in f if line.strip()]
+        record = struct.Struct(header["record"])
+        data = f.read()
+    usable = len(data) - len(data) % record.size  # A file cut short mid-record keeps its whole records
+    return header, [{"round": round_number, "tick": tick, "event": KINDS[code], "x": x, "y": y, "value": value}
+                    for round_number, tick, code, x, y, value in record.iter_unpack(data[:usable])]
@@ -0,0 +1,80 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class DigitAtlas:
+    # Pre-rendered digits of one font and colour. Numbers are composed by
+    # blitting glyphs instead of rasterising the whole string again.
+    def __init__(self, font, color):
+        self.font = font
+        self.color = color
+        self.glyphs = {char: font.render(char, True, color) for char in "0123456789-"}
+        self.labels = {}  # Static prefixes such as "Score: "
+        self.height = max(glyph.get_height() for glyph in self.glyphs.values())
+
+    def label(self, prefix):
+        surface = self.labels.get(prefix)
+        if surface is None:
+            surface = self.labels[prefix] = self.font.render(prefix, True, self.color)
+        return surface
+
+    def render(self, value, prefix=""):
+        label = self.label(prefix) if prefix else None
+        glyphs = [self.glyphs[char] for char in str(int(value))]
+        width = sum(glyph.get_width() for glyph in glyphs)
+        height = self.height
+        if label is not None:
+            width += label.get_width()
+            height = max(height, label.get_height())
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        x = 0
+        if label is not None:
+            surface.blit(label, (0, 0))
+            x = label.get_width()
+        for glyph in glyphs:
+            surface.blit(glyph, (x, 0))
+            x += glyph.get_width()
+        return surface
+
+
+class TextCache:
+    # Fonts cached per size and an LRU cache of rendered strings keyed by
+    # (text, colour, size), so menus and tables are only rasterised once
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.fonts = {}
+        self.rendered = OrderedDict()
+        self.atlases = {}
+
+    def font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.Font(None, size)
+        return font
+
+    def render(self, text, color, size):
+        key = (text, tuple(color), size)
+        surface = self.rendered.get(key)
+        if surface is not None:
+            self.rendered.move_to_end(key)
+            return surface
+        surface = self.rendered[key] = self.font(size).render(text, True, color)
+        if len(self.rendered) > self.max_entries:
+            self.rendered.popitem(last=False)
+        return surface
+
+    def digits(self, size, color):
+        key = (size, tuple(color))
+        atlas = self.atlases.get(key)
+        if atlas is None:
+            atlas = self.atlases[key] = DigitAtlas(self.font(size), color)
+        return atlas
+
+    def clear(self):
+        self.fonts.clear()
+        self.rendered.clear()
+        self.atlases.clear()
+
+
+text = TextCache()
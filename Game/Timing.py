@@ -0,0 +1,68 @@
+import logging
+import time
+
+from . Config import MAX_CATCHUP_TICKS, TICK_RATE
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    # Records how long each startup phase took and logs the breakdown once
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.last = self.started
+        self.phases = []  # (name, seconds) in the order they finished
+        self.reported = False
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    def marked(self, name):
+        return any(phase == name for phase, _ in self.phases)
+
+    @property
+    def total(self):
+        return self.last - self.started
+
+    def report(self):
+        if self.reported:
+            return
+        self.reported = True
+        breakdown = ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in self.phases)
+        logger.info("Startup took %.1f ms: %s", self.total * 1000, breakdown)
+
+
+class FixedTimestep:
+    # Turns variable frame times into whole simulation ticks of a fixed
+    # length, so gameplay speed does not depend on the render rate. Time left
+    # over is carried to the next frame and exposed as alpha for
+    # interpolating between the last two ticks. If a frame would need more
+    # than max_ticks ticks, the backlog is dropped and the game slows down
+    # instead of spiralling.
+    def __init__(self, tick_rate=TICK_RATE, max_ticks=MAX_CATCHUP_TICKS):
+        self.tick_ms = 1000 / tick_rate
+        self.max_ticks = max_ticks
+        self.accumulator = 0.0
+        self.dropped = 0  # Ticks skipped because of the catch-up cap
+
+    def reset(self):
+        self.accumulator = 0.0
+
+    def advance(self, elapsed_ms):
+        # Number of ticks to simulate for a frame that took elapsed_ms
+        self.accumulator += elapsed_ms
+        ticks = int(self.accumulator // self.tick_ms)
+        if ticks > self.max_ticks:
+            self.dropped += ticks - self.max_ticks
+            ticks = self.max_ticks
+            self.accumulator %= self.tick_ms
+        else:
+            self.accumulator -= ticks * self.tick_ms
+        return ticks
+
+    @property
+    def alpha(self):
+        # Fraction of a tick since the last simulated tick
+        return self.accumulator / self.tick_ms
@@ -1,241 +1,486 @@
+import time
+
+started = time.perf_counter()  # Start of the startup timing breakdown
+
 import os
 import random
 import sys
-import numpy as np
 import pygame
-import scipy
-from . Config import BACKGROUND_WIDTH, BLACK, FPS, GREEN, RED, WHITE, SCREEN_HEIGHT, SCREEN_WIDTH
-from . Sprites import Score, Player, Zombie, Coin, Platform
-
-pygame.init()
-
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("The Adventures of Py.Man")
+from . Animation import AnimationClock
+from . Assets import assets
+from . Background import Background, BackgroundLayer
+from . Camera import Camera
+from . Culling import ZombieCulling
+from . Config import (
+    ADAPTIVE_RESOLUTION, ASSET_PACK, BACKGROUND_LAYERS, BLUR_THREADED, CULL_MARGIN, ENDLESS,
+    FRAME_BUDGET_MS, FULLSCREEN, OFFSCREEN_ZOMBIES, PROFILE, PROFILE_EXPORT, RECORD_DIR,
+    RECORD_KEEP, RENDER_MODE, RENDER_SCALE, RENDER_SCALES, SCALE_FILTER, SCREEN_HEIGHT,
+    SCREEN_WIDTH, TELEMETRY_BUFFER, TELEMETRY_DIR, TELEMETRY_FILE_BYTES, TELEMETRY_FORMAT,
+    TELEMETRY_OVERFLOW, TICK_RATE, WINDOW_SIZE, ZOMBIE_SYSTEM)
+from . Display import AdaptiveResolution, Display
+from . Effects import BackdropBlur
+from . Highscores import HighscoreStore, NullHighscores
+from . Input import KeyboardInput
+from . Level import LevelStreamer
+from . Pack import open_pack
+from . Pool import EntityPool
+from . Profiler import FrameProfiler, NullProfiler, ProfilerOverlay
+from . Renderer import DirtyRenderer, FullRenderer
+from . Replay import RecordingInput, prune_recordings, save_recording
+from . Scenes import LoadingScene
+from . Spatial import SpatialHash
+from . Sprites import ANIMATIONS, Score, Player, Zombie, Coin, Platform
+from . Telemetry import NullTelemetry, Telemetry
+from . Timing import FixedTimestep, StartupTimer
 
-og_background_image = pygame.image.load('Game/static/images/background.png')
-background_image = pygame.transform.scale(og_background_image, (SCREEN_WIDTH, SCREEN_HEIGHT))
 highscore_file = "highscores.txt"  # File to store high scores
+BACKGROUND_IMAGE = ('Game/static/images/background.png', (SCREEN_WIDTH, SCREEN_HEIGHT), False)
 
 
-font = pygame.font.SysFont(None, 55)
+def startup_images():
+    # (path, size, alpha) of every image loaded before the menu; these are
+    # what the asset pack holds
+    images = [BACKGROUND_IMAGE] + [(path, size, True) for path, size, _, _ in BACKGROUND_LAYERS]
+    for pattern, count, size in ANIMATIONS:
+        images.extend((pattern.format(i), size, True) for i in range(count))
+    return images
+
 
 class Game:
-    def __init__(self):
-        self.screen = screen
+    def __init__(self, headless=False, seed=None, input_source=None, render_mode=RENDER_MODE,
+                 zombie_system=ZOMBIE_SYSTEM, endless=ENDLESS, profile=PROFILE, profile_export=PROFILE_EXPORT,
+                 record=RECORD_DIR, offscreen_zombies=OFFSCREEN_ZOMBIES, render_scale=RENDER_SCALE, telemetry=TELEMETRY_DIR):
+        self.startup = StartupTimer(started)
+        self.startup.mark("imports")
+        self.headless = headless  # No window, no flip and no blocking screens
+        if seed is None:
+            seed = random.randrange(1 << 63)  # Kept so the round can be replayed
+        self.seed = seed
+        self.random = random.Random(seed)  # Every level and spawn roll comes from here
+        self.input = input_source or KeyboardInput()  # Anything with get_pressed()
+        # Played rounds log their keys, so they can be replayed and audited
+        self.recorder = None
+        self.recording_path = None
+        if record and not headless:
+            self.recorder = self.input = RecordingInput(self.input)
+            self.recording_path = os.path.join(record, f"{time.strftime('%Y%m%d-%H%M%S')}-{seed}.replay")
+        self.render_mode = render_mode
+        self.zombie_system = zombie_system  # "sprites" or "swarm"
+        self.endless = endless  # Stream chunks forever instead of a fixed level
+        self.offscreen_zombies = offscreen_zombies  # "update", "patrol" or "freeze"
+        # Everything is drawn into the canvas at the internal render
+        # resolution, which is scaled to the window once per frame
+        adaptive = ADAPTIVE_RESOLUTION and not headless
+        self.display = Display(headless, render_scale, WINDOW_SIZE, FULLSCREEN, SCALE_FILTER, adaptive)
+        self.screen = self.display.canvas
+        self.resolution = None  # Picks the render scale by frame time
+        if adaptive:
+            self.resolution = AdaptiveResolution(RENDER_SCALES, FRAME_BUDGET_MS, render_scale)
+        self.frames_drawn = 0  # Identifies the frame on screen for cached effects
+        self.backdrop = BackdropBlur(threaded=BLUR_THREADED)
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep()  # Simulation ticks per rendered frame
+        self.animation_clock = AnimationClock()  # Drives every animated sprite, reset each round
+        # Zombies and coins are recycled across rounds; the pools are built
+        # with the first level, once the images are loaded
+        self.zombie_pool = None
+        self.coin_pool = None
+        self.previous = None  # Camera x and moving sprite positions before the last tick
+        self.running = True
+        self.ticks = 0  # Number of update steps simulated
+        self.result = None  # "dead" or "won" once the round is over
+        # Only played games read and write the shared high-score journal
+        self.highscores = NullHighscores() if headless else HighscoreStore(highscore_file)
+        # Frame phases are only timed when profiling is on
+        self.profiler = FrameProfiler() if profile else NullProfiler()
+        self.profile_export = profile_export
+        self.overlay = ProfilerOverlay(self.profiler) if profile else None
+        # Gameplay events are only recorded when telemetry is on
+        self.telemetry = NullTelemetry()
+        if telemetry:
+            self.telemetry = Telemetry(telemetry, TELEMETRY_FORMAT, TELEMETRY_BUFFER, TELEMETRY_OVERFLOW, TELEMETRY_FILE_BYTES)
+        self.startup.mark("display")
+
+        # Sprite images are decoded on a background thread while the loading
+        # screen runs; the level is built once they are all in the cache.
+        # Images in the baked asset pack are sliced out of it right away.
+        self.scene = None
+        if ASSET_PACK and assets.pack is None:
+            assets.use_pack(open_pack(ASSET_PACK))
+        self.preloader = assets.preload(images=startup_images())
+        if headless:
+            self.preloader.wait()
+            self.finish_loading()
+
+    def finish_loading(self):
+        self.startup.mark("assets")
+        self.build_renderer()
+        self.build_level()
+        self.startup.mark("level")
+        if not self.headless:
+            # Render the level once so the menu has something to blur
+            self.renderer.draw(self.screen, self.camera, self.visible_sprites(self.camera), self.hud)
+            self.frames_drawn += 1
+
+    def frame_presented(self):
+        # Startup ends with the first frame on screen, whichever scene draws
+        # it, and is reported once the level is built as well
+        startup = self.startup
+        if startup.reported:
+            return
+        if not startup.marked("first frame"):
+            startup.mark("first frame")
+        if startup.marked("level"):
+            startup.report()
+
+    def build_renderer(self):
+        # The background and its parallax layers are composed into
+        # display-format strips at the canvas size once, so each layer is one
+        # blit per frame
+        scale = self.display.scale
+        layers = [BackgroundLayer(assets.image(*BACKGROUND_IMAGE), scale=scale)]
+        for path, size, factor, y in BACKGROUND_LAYERS:
+            layers.append(BackgroundLayer(assets.image(path, size), factor, y, scale=scale))
+        self.background = Background(layers, height=self.screen.get_height())
+        renderer = DirtyRenderer if self.render_mode == "dirty" else FullRenderer
+        self.renderer = renderer(self.background, scale)
+
+    def set_render_scale(self, scale):
+        # Switch the internal render resolution; the next frame is drawn in full
+        self.display.set_scale(scale)
+        self.screen = self.display.canvas
+        self.build_renderer()
+
+    def reset(self, seed=None):
+        # Start a new round in place, keeping the display and loaded assets
+        if seed is None:
+            seed = random.randrange(1 << 63)
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.ticks = 0
+        self.result = None
         self.running = True
-        self.background_offset = 0
-        self.show_menu = True  # Flag to show the menu
+        self.previous = None
+        self.build_level()
+        self.renderer.invalidate()
+
+    def build_level(self):
+        self.telemetry.start_round(self.seed)
+        self.camera = Camera()  # Entities keep world positions, the camera scrolls
         self.score = Score(10,10)
+        self.hud = [self.score]  # Drawn in screen space on top of the level
         self.coins_collected = 0
-        self.highscores = self.load_highscores()
+        self.animation_clock.reset()
+
+        # Zombies and coins are recycled, so spawns during play never
+        # allocate. A new round first hands the last round's back.
+        if self.zombie_pool is None:
+            clock = self.animation_clock
+            swarm = self.zombie_system == "swarm"
+            self.zombie_pool = EntityPool(lambda: Zombie(0, 0, clock), prefill=0 if swarm else 16)
+            self.coin_pool = EntityPool(lambda: Coin(0, 0, clock), prefill=32)
+        else:
+            self.release_entities()
 
+        # Zombies are either individual sprites or views into a vectorized swarm
+        self.swarm = None
+        if self.zombie_system == "swarm":
+            from . Swarm import ZombieSwarm
+            self.swarm = ZombieSwarm(self.animation_clock)
 
         # Create player object
-        self.player = Player(100, SCREEN_HEIGHT - 70)
-        
-        # Create a list of random zombies
-        self.zombies = self.create_random_zombies()
-        
-        # Create a list of platforms
-        self.platforms = self.create_random_platforms()
-        
-        # Create a list of coins
-        self.coins = self.create_random_coins()
+        self.player = Player(100, SCREEN_HEIGHT - 70, self.animation_clock)
 
-        # Group for all sprites
+        # Group for all sprites; draw_order keeps the order they were added in
         self.all_sprites = pygame.sprite.Group()
-        self.all_sprites.add(self.score)
         self.all_sprites.add(self.player)
-        # Add all zombies to the sprite group
-        for zombie in self.zombies:
-            self.all_sprites.add(zombie)
-        # Add all platforms to the sprite group
-        for platform in self.platforms:
-            self.all_sprites.add(platform)
-        # Add all coins to the sprite group
+        self.draw_order = {self.player: 0}
+        self.added = 1
+
+        # Broadphase grids so collision checks only look at nearby entities
+        self.zombie_grid = SpatialHash()
+        self.platform_grid = SpatialHash()
+        self.coin_grid = SpatialHash()
+        self.zombies = []
+        # Off-screen sprite zombies skip their updates; swarms step every
+        # zombie in one batch anyway
+        self.culling = None
+        if self.swarm is None and self.offscreen_zombies != "update":
+            self.culling = ZombieCulling(self.offscreen_zombies)
+        self.platforms = []
+        self.coins = []
+
+        if self.endless:
+            # Chunks are generated ahead of the camera and dropped behind it
+            self.level = LevelStreamer(self, self.random.getrandbits(64))
+            self.level.update(self.camera)
+        else:
+            self.level = None
+            for zombie in self.create_random_zombies():
+                self.add_zombie(zombie)
+            for platform in self.create_random_platforms():
+                self.add_platform(platform)
+            for coin in self.create_random_coins():
+                self.add_coin(coin)
+
+    def release_entities(self):
+        # Return the last round's zombies and coins to the pools; swarm
+        # zombies go with their swarm
+        if self.swarm is None:
+            for zombie in self.zombies:
+                zombie.kill()
+                self.zombie_pool.release(zombie)
         for coin in self.coins:
-            self.all_sprites.add(coin)
+            coin.kill()
+            self.coin_pool.release(coin)
 
-        self.backgrounds = [background_image.copy(), background_image.copy()]
-        self.background_x = [0, SCREEN_WIDTH]  # Positions of the two backgrounds
-    
     def create_random_zombies(self):
-        num_zombies = random.randint(5, 8)  # Randomly decide the number of zombies between 5 and 15
+        num_zombies = self.random.randint(5, 8)  # Randomly decide the number of zombies between 5 and 15
         zombies = []
         for _ in range(num_zombies):
-            x_pos = random.randint(400, SCREEN_WIDTH)  # Random x position within a range
-            zombie = Zombie(x_pos, SCREEN_HEIGHT - 70)
+            x_pos = self.random.randint(400, SCREEN_WIDTH)  # Random x position within a range
+            zombie = self.new_zombie(x_pos, SCREEN_HEIGHT - 70)
             zombies.append(zombie)
         return zombies
+
+    def new_zombie(self, x, y):
+        if self.swarm is not None:
+            return self.swarm.add(x, y)
+        return self.zombie_pool.acquire(x, y)
+
+    def new_coin(self, x, y):
+        return self.coin_pool.acquire(x, y)
+
+    def pool_occupancy(self):
+        zombies = self.swarm if self.swarm is not None else self.zombie_pool
+        return {"zombies": zombies.occupancy(), "coins": self.coin_pool.occupancy()}
+    
+    def add_zombie(self, zombie):
+        self.zombies.append(zombie)
+        self.add_sprite(zombie)
+        if self.culling is not None:
+            self.culling.add(zombie)
+        if self.swarm is None:
+            self.zombie_grid.insert(zombie)
+
+    def remove_zombie(self, zombie):
+        self.zombies.remove(zombie)
+        self.remove_sprite(zombie)
+        if self.culling is not None:
+            self.culling.remove(zombie)
+        if self.swarm is not None:
+            self.swarm.remove(zombie)
+        else:
+            self.zombie_grid.remove(zombie)
+            self.zombie_pool.release(zombie)
+        if self.level is not None:
+            self.level.forget(zombie)
+
+    def add_sprite(self, sprite):
+        self.all_sprites.add(sprite)
+        self.draw_order[sprite] = self.added
+        self.added += 1
+
+    def remove_sprite(self, sprite):
+        sprite.kill()
+        del self.draw_order[sprite]
+
+    def update_area(self):
+        # World area in which zombies are updated and sprites are drawn
+        return self.camera.viewport.inflate(2 * CULL_MARGIN, 2 * CULL_MARGIN)
+
+    def visible_sprites(self, camera):
+        # Sprites near the screen, in the order they were added like all_sprites
+        area = camera.viewport.inflate(2 * CULL_MARGIN, 2 * CULL_MARGIN)
+        zombies = self.swarm if self.swarm is not None else self.zombie_grid
+        sprites = [self.player]
+        sprites += zombies.query(area)
+        sprites += self.platform_grid.query(area)
+        sprites += self.coin_grid.query(area)
+        sprites.sort(key=self.draw_order.__getitem__)
+        return sprites
+
+    def add_platform(self, platform):
+        self.platforms.append(platform)
+        self.add_sprite(platform)
+        self.platform_grid.insert(platform)
+
+    def remove_platform(self, platform):
+        self.platforms.remove(platform)
+        self.platform_grid.remove(platform)
+        self.remove_sprite(platform)
+        if self.level is not None:
+            self.level.forget(platform)
+
+    def add_coin(self, coin):
+        self.coins.append(coin)
+        self.add_sprite(coin)
+        self.coin_grid.insert(coin)
+
+    def remove_coin(self, coin):
+        self.coins.remove(coin)
+        self.coin_grid.remove(coin)
+        self.remove_sprite(coin)
+        self.coin_pool.release(coin)
+        if self.level is not None:
+            self.level.forget(coin)
     
     def create_random_platforms(self):
-        num_platforms = random.randint(5, 10)  # Randomly decide the number of platforms
+        num_platforms = self.random.randint(5, 10)  # Randomly decide the number of platforms
         platforms = []
         for _ in range(num_platforms):
-            x_pos = random.randint(100, SCREEN_WIDTH * 3)
-            y_pos = random.randint(SCREEN_HEIGHT -300, SCREEN_HEIGHT -60)  # Random y position within a range
-            width = random.randint(100, 200)  # Random platform width
+            x_pos = self.random.randint(100, SCREEN_WIDTH * 3)
+            y_pos = self.random.randint(SCREEN_HEIGHT -300, SCREEN_HEIGHT -60)  # Random y position within a range
+            width = self.random.randint(100, 200)  # Random platform width
             platform = Platform(x_pos, y_pos, width, 20)
             platforms.append(platform)
         return platforms
     
     def create_random_coins(self):
-        num_coints = random.randint(10, 20)  # Randomly decide the number of
+        num_coints = self.random.randint(10, 20)  # Randomly decide the number of
         coins = []
         for _ in range(num_coints):
-            x_pos = random.randint(200, SCREEN_WIDTH * 3)  # Random x position within a range
-            y_pos = random.randint(SCREEN_HEIGHT- 200, SCREEN_HEIGHT - 60)  # Random y position within a range
-            coin = Coin(x_pos, y_pos)
+            x_pos = self.random.randint(200, SCREEN_WIDTH * 3)  # Random x position within a range
+            y_pos = self.random.randint(SCREEN_HEIGHT- 200, SCREEN_HEIGHT - 60)  # Random y position within a range
+            coin = self.new_coin(x_pos, y_pos)
             coins.append(coin)
         return coins
     
-    def load_highscores(self):
-        if os.path.exists(highscore_file):
-            with open(highscore_file, "r") as f:
-                highscores = [line.strip().split(",") for line in f.readlines()]
-                highscores = [(name, int(score)) for name, score in highscores]
-        else:
-            highscores = []
-        return highscores
-
-    def save_highscores(self):
-        with open(highscore_file, "w") as f:
-            for name, score in self.highscores:
-                f.write(f"{name},{score}\n")
-
     def check_for_highscore(self):
-        if len(self.highscores) < 10 or self.score.score > self.highscores[-1][1]:
-            return True
-        return False
-
-    def add_highscore(self):
-        if self.check_for_highscore():
-            self.display_highscore_input()
-
-    def display_highscore_input(self):
-        input_active = True
-        player_name = ""
-        
-        while input_active:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    input_active = False
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RETURN:
-                        if player_name.strip():  # Ensure player_name is not empty
-                            input_active = False
-                        else:
-                            player_name = "Anonymous"  # Default to "Anonymous" if no name is provided
-                    elif event.key == pygame.K_BACKSPACE:
-                        player_name = player_name[:-1]
-                    else:
-                        player_name += event.unicode
-            
-            # Display the input prompt
-            self.screen.fill(WHITE)
-            prompt = font.render("Enter your name:", True, GREEN)
-            prompt_rect = prompt.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
-            self.screen.blit(prompt, prompt_rect)
-            
-            name_surface = font.render(player_name, True, GREEN)
-            name_rect = name_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-            self.screen.blit(name_surface, name_rect)
-            
-            pygame.display.flip()
-
-        # Add the new high score and sort the list
-        self.highscores.append((player_name, self.score.score))
-        self.highscores.sort(key=lambda x: x[1], reverse=True)
-        self.highscores = self.highscores[:10]  # Keep only the top 10 scores
-        self.save_highscores()
-
-        
+        return self.highscores.qualifies(self.score.score)
+
+    def step(self, n=1, render=False):
+        # Advance the simulation n ticks as fast as possible, without pacing
+        for _ in range(n):
+            if not self.running or self.result is not None:
+                break
+            self.profiler.begin()
+            if not self.headless:
+                self.events()
+            self.profiler.lap("events")
+            self.update()
+            if render:
+                self.draw()
+            self.profiler.end()
+        return self.running
+
+    def snapshot(self):
+        # Plain-data view of the simulation state, for comparing runs
+        if self.culling is not None:
+            self.culling.catch_up(self.ticks)
+        return {
+            "ticks": self.ticks,
+            "score": self.score.score,
+            "result": self.result,
+            "camera": self.camera.x,
+            "player": tuple(self.player.rect),
+            "zombies": [tuple(zombie.rect) for zombie in self.zombies],
+            "coins": [tuple(coin.rect) for coin in self.coins],
+        }
 
     def run(self):
+        if self.headless:
+            while self.running:
+                self.step()
+            self.export_profile()
+            self.telemetry.close()
+            return self.result
+
+        # One paced loop for every screen; the current scene decides what a
+        # frame does and how often frames come
+        self.switch(LoadingScene(self))
+        elapsed = 0
         while self.running:
-            if self.show_menu:
-                self.display_menu()
-            else:
-                self.events()
-                self.update()
-                self.draw()
-            self.clock.tick(FPS)
+            self.scene.frame(pygame.event.get(), elapsed)
+            # Paced by the scene now current, so the first frame after a
+            # switch does not wait out the old scene's slower rate
+            elapsed = self.clock.tick(self.scene.fps)
         
+        self.export_profile()
+        self.save_recording()
+        self.highscores.close()  # Finish pending high-score writes
+        self.telemetry.close()  # Write out the buffered events
         pygame.quit()
         sys.exit()
-        
-    def display_menu(self):
-        # Blur the background
-        surface_array = pygame.surfarray.array3d(self.screen)
 
-        # Apply a blur effect
-        blurred_array = scipy.ndimage.gaussian_filter(surface_array, sigma=(5, 5, 0))
+    def switch(self, scene):
+        self.scene = scene
+        scene.enter()
 
-        # Convert back to pygame surface and draw
-        blurred_surface = pygame.surfarray.make_surface(np.transpose(blurred_array, (1, 0, 2)))
-        self.screen.blit(blurred_surface, (0, 0))
+    def save_recording(self):
+        if self.recorder is not None and self.recorder.ticks:
+            save_recording(self.recording_path, self, self.recorder)
+            prune_recordings(os.path.dirname(self.recording_path), RECORD_KEEP, self.highscores.replays())
 
-        # Render the game title
-        title_font = pygame.font.Font(None, 74)  # You can adjust the size and font
-        title = title_font.render("URBAN ZOMBIE WARRIOR", True, WHITE)
-        title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))  # Adjust position as needed
-        self.screen.blit(title, title_rect)
-
-        # Render play button
-        play_button = font.render("PRESS ENTER TO CONTINUE", True, WHITE)
-        button_rect = play_button.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-        self.screen.blit(play_button, button_rect)
-
-        # Update the display
-        pygame.display.flip()
-
-        # Wait for user interaction
-        self.wait_for_menu_input()
-    
-    def display_highscores(self):
-        highscore_font = pygame.font.Font(None, 36)
-        title = highscore_font.render("High Scores", True, WHITE)
-        self.screen.blit(title, (50, 50))
-
-        for i, (name, score) in enumerate(self.highscores):
-            score_text = f"{i+1}. {name} - {score}"
-            score_surface = highscore_font.render(score_text, True, WHITE)
-            self.screen.blit(score_surface, (50, 100 + i * 30))
-
-    def wait_for_menu_input(self):
-        while self.show_menu:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    self.show_menu = False
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RETURN:  # Press Enter to start the game
-                        self.show_menu = False
+    def export_profile(self):
+        if self.profiler.enabled and self.profile_export:
+            self.profiler.export(self.profile_export)
 
+    def toggle_overlay(self):
+        if self.overlay is None:
+            return
+        if self.overlay in self.hud:
+            self.hud.remove(self.overlay)
+        else:
+            self.hud.append(self.overlay)
+        
     def events(self):
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
+            self.handle_event(event)
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.running = False
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            self.toggle_overlay()
 
     def update(self):
-        keys = pygame.key.get_pressed()
+        keys = self.input.get_pressed()
+        self.ticks += 1
+        self.animation_clock.advance(1000 / TICK_RATE)  # One shared animation tick per update
+        if not self.headless:
+            # Remember where things were, to draw frames between this tick and
+            # the next. Only zombies near the screen can be drawn, so only
+            # theirs are kept.
+            if self.culling is not None:
+                zombies = self.culling.awake
+            elif self.swarm is not None:
+                zombies = self.swarm.query(self.update_area())
+            else:
+                zombies = self.zombie_grid.query(self.update_area())
+            self.previous = (self.camera.x, {sprite: sprite.rect.topleft for sprite in [self.player, *zombies]})
 
         # Prepare a list to store zombies to remove
         zombies_to_remove = []
 
         # Update zombies and check for collisions
         player_died = False
-        for zombie in self.zombies:
-            zombie.update()  # Update each zombie's position
-
-            # Check for collisions only with alive zombies
+        if self.swarm is not None:
+            self.swarm.update()  # Every zombie moves in one batched step
+            nearby_zombies = self.swarm.query(self.player.rect)
+        elif self.culling is None:
+            for zombie in self.zombies:
+                zombie.update()  # Update each zombie's position
+                self.zombie_grid.move(zombie)
+            nearby_zombies = self.zombie_grid.query(self.player.rect)
+        else:
+            # Only zombies near the screen are updated
+            area = self.update_area()
+            self.culling.wake(area, self.ticks)
+            for zombie in self.culling.awake:
+                zombie.update()
+                self.zombie_grid.move(zombie)
+            self.culling.park(area, self.ticks)
+            nearby_zombies = self.zombie_grid.query(self.player.rect)
+
+        # Check for collisions only with zombies near the player
+        for zombie in nearby_zombies:
             if pygame.sprite.collide_rect(self.player, zombie):
                 if (self.player.rect.bottom <= zombie.rect.top + 10 and self.player.velocity.y > 0):
                     # Mark zombie for removal if the player lands on it
                     zombies_to_remove.append(zombie)
                     self.score.increase_score(100)  # Increase the score by 100
+                    self.telemetry.emit("stomp", self.ticks, zombie.rect.x, zombie.rect.y, self.score.score)
                     self.player.velocity.y = self.player.jump_speed  # Bounce the player up
                 else:
                     # Player collided with the side of the zombie
@@ -243,9 +488,7 @@ class Game:
 
         # Remove zombies that have been marked for removal
         for zombie in zombies_to_remove:
-            self.all_sprites.remove(zombie)
-            self.zombies.remove(zombie)
-            zombie.kill()
+            self.remove_zombie(zombie)
         
         
 
@@ -253,8 +496,13 @@ class Game:
             
         # Adds new zombies if score is high enough
         if self.coins_collected > 3:
-            self.zombies.append(Zombie(random.randint(100, 500), 10))
+            zombie = self.new_zombie(self.camera.x + self.random.randint(100, 500), 10)
+            self.add_zombie(zombie)
+            self.telemetry.emit("spawn", self.ticks, zombie.rect.x, zombie.rect.y, self.score.score)
+            if self.level is not None:
+                self.level.adopt(zombie)
             self.coins_collected -= 3  # Decrease the score by 100 when new zombies are added
+        self.profiler.lap("zombies")
 
         
 
@@ -263,134 +511,79 @@ class Game:
             self.player.update(keys)
 
         if player_died:
-            self.display_death_message()
-            self.running = False  # End the game when the player dies
+            self.result = "dead"  # Windowed games go on to the death screen
+            self.telemetry.emit("death", self.ticks, self.player.rect.x, self.player.rect.y, self.score.score)
+            if self.headless:
+                self.running = False  # End the game when the player dies
+        self.profiler.lap("player")
             
-        # Check for collision with platforms   
-        for platform in self.platforms:
+        # Check for collision with platforms near the player
+        for platform in self.platform_grid.query(self.player.rect):
             if self.player.rect.colliderect(platform.rect):
                 if self.player.velocity.y > 0 and self.player.rect.bottom <= platform.rect.bottom:
                     self.player.velocity.y = 0
                     self.player.on_ground = True
                     self.player.rect.bottom = platform.rect.top
+        self.profiler.lap("platforms")
         
-        # CHeck for collision with coins
-        for coin in self.coins:
-            coin.animate()
+        # Check for collision with coins near the player
+        for coin in self.coin_grid.query(self.player.rect):
             if pygame.sprite.collide_rect(self.player, coin):
-                coin.kill()  # Remove the coin when the player collects it
-                self.coins.remove(coin) # Removes coins from listd
+                self.remove_coin(coin)  # Remove the coin when the player collects it
                 self.coins_collected += 1  # Increase the coins collected
                 self.score.increase_score(100)  # Increase the score by 10 when a coin is
-
-        # Check if all coins have been collected
-        if len(self.coins) == 0:
-            self.display_win_message()
-            self.running = False  # End the game when all coins have been collected
+                self.telemetry.emit("coin", self.ticks, coin.rect.x, coin.rect.y, self.score.score)
+
+        # Check if all coins have been collected; endless runs have no last coin
+        if not self.endless and len(self.coins) == 0:
+            self.result = "won"  # Windowed games go on to the win screen
+            self.telemetry.emit("win", self.ticks, self.player.rect.x, self.player.rect.y, self.score.score)
+            if self.headless:
+                self.running = False  # End the game when all coins have been collected
+        self.profiler.lap("coins")
         
         
 
-        # Determine if player needs to scroll
-        # If the player has reached certain bounds near the edges of the screen
+        # The world scrolls opposite to the player's movement while the player
+        # stays within the band in the middle of the screen
         scroll_speed = self.player.velocity.x  # Use the player's current speed for scrolling
-        if self.player.rect.right > 600 and keys[pygame.K_d]:
-            self.background_offset -= scroll_speed
-
-            # Prevent player from scrolling past the edges
-            self.player.rect.right = 600
-        elif self.player.rect.left < 200 and keys[pygame.K_a]:
-            self.background_offset += scroll_speed
-            self.player.rect.left = 200
-
-        # Update each sprite's position based on the background offset
-        for zombie in self.zombies:
-            if zombie.alive():
-                zombie.rect.x -= scroll_speed  # Move zombies in the opposite direction of the player scroll
-
-        # Prevent scrolling beyond the background image
-        self.background_offset = max(-SCREEN_WIDTH, min(0, self.background_offset))
-
-        # Update background positions based on player movement
-        for i in range(len(self.background_x)):
-            self.background_x[i] -= scroll_speed  # Move background opposite to player
-
-            # Move platforms with the background
-            for platform in self.platforms:
-                platform.rect.x -= scroll_speed
-                
-            # Move coins with the background
-            for coin in self.coins:
-                coin.rect.x -= scroll_speed
-
-
-            # Reset the background position when it goes off screen
-            if self.background_x[i] < -BACKGROUND_WIDTH:
-                self.background_x[i] += BACKGROUND_WIDTH * 2
-            elif self.background_x[i] > BACKGROUND_WIDTH:
-                self.background_x[i] -= BACKGROUND_WIDTH * 2
+        if keys[pygame.K_d]:
+            self.camera.keep_in_band(self.player.rect, 1)
+        elif keys[pygame.K_a]:
+            self.camera.keep_in_band(self.player.rect, -1)
+        self.camera.scroll(scroll_speed)
+        self.player.rect.x += scroll_speed  # Keep the player's place on screen
+        if self.level is not None:
+            self.level.update(self.camera)
+        self.profiler.lap("scroll")
+
+    def draw(self, alpha=1.0):
+        # alpha is how far the frame is between the previous tick and the
+        # last one; 1 draws the last tick as it is
+        camera = self.camera
+        offsets = None
+        if alpha < 1 and self.previous is not None:
+            previous_x, positions = self.previous
+            camera = self.camera.interpolated(previous_x, alpha)
+            offsets = {}
+            back = 1 - alpha
+            for sprite, (x, y) in positions.items():
+                rect = sprite.rect
+                dx = round((x - rect.x) * back)
+                dy = round((y - rect.y) * back)
+                if dx or dy:
+                    offsets[sprite] = (dx, dy)
+        if self.overlay is not None and self.overlay in self.hud:
+            self.overlay.update()
+        dirty = self.renderer.draw(self.screen, camera, self.visible_sprites(camera), self.hud, offsets)
+        self.frames_drawn += 1
+        self.profiler.lap("draw")
+        if self.headless:
+            return
+        self.display.present(dirty)
+        self.profiler.lap("flip")
         
 
-
-
-    def draw(self):
-        self.screen.fill(WHITE)
-        for bg in self.background_x:
-            self.screen.blit(background_image, (bg, 0))
-        self.all_sprites.draw(self.screen)
-        pygame.display.flip()
-        
-
-    def display_death_message(self):
-        # Capture the screen
-        surface_array = pygame.surfarray.array3d(self.screen)
-        surface_array = np.transpose(surface_array, (1, 0, 2))
-
-        # Apply a blur effect
-        blurred_array = scipy.ndimage.gaussian_filter(surface_array, sigma=(5, 5, 0))
-
-        # Convert back to pygame surface and draw
-        blurred_surface = pygame.surfarray.make_surface(np.transpose(blurred_array, (1, 0, 2)))
-        self.screen.blit(blurred_surface, (0, 0))
-
-        # Render death messaged
-        death_message = font.render(f"WASTED Score:{self.score.score}", True, RED)
-        death_rect = death_message.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-        self.screen.blit(death_message, death_rect)
-        pygame.display.flip()
-        
-        pygame.time.wait(5000)  # Display the message for 2 seconds
-        
-        # Clear the screen
-        self.screen.fill(BLACK)
-        pygame.display.flip()
-        
-        self.display_highscores()
-        
-        pygame.time.wait(5000)  # Display the highscores for 2 seconds
-
-        
-    def display_win_message(self):
-        # Capture the screen
-        surface_array = pygame.surfarray.array3d(self.screen)
-        surface_array = np.transpose(surface_array, (1, 0, 2))
-
-        # Apply a blur effect
-        blurred_array = scipy.ndimage.gaussian_filter(surface_array, sigma=(5, 5, 0))
-
-        # Convert back to pygame surface and draw
-        blurred_surface = pygame.surfarray.make_surface(np.transpose(blurred_array, (1, 0, 2)))
-        self.screen.blit(blurred_surface, (0, 0))
-
-        # Render win message
-        win_message = font.render(f"YOU WIN Score:{self.score.score}", True, GREEN)
-        win_rect = win_message.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-        self.screen.blit(win_message, win_rect)
-        pygame.display.flip()
-        
-        pygame.time.wait(5000)  # Display the message for 2 seconds
-        
-        self.add_highscore()
-        self.display_highscores()
-        self.save_highscores()
-        
-        pygame.time.wait(5000)  # Display the highscores for 2 seconds
\ No newline at end of file
+    def blur_backdrop(self):
+        # The blurred frame is cached until another game frame is drawn
+        self.screen.blit(self.backdrop.get(self.screen, self.frames_drawn), (0, 0))
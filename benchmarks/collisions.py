@@ -0,0 +1,113 @@
+# Per-tick collision cost of the SpatialHash broadphase against a linear scan.
+# Entities are spread at constant density over a level whose width grows with
+# the entity count, like a longer level rather than a more crowded screen.
+# Every tick a share of them moves, as the zombies do, and the player's rect
+# is checked against all of them.
+#
+# The two costs of the grid are reported separately: the query and
+# narrowphase, which should stay flat as the level grows, and re-bucketing
+# the entities that moved (grid.move), which grows with the number of movers.
+#
+#   python -m benchmarks.collisions [--moving-fraction 0.25] [--json results.json]
+import argparse
+import json
+import random
+import time
+
+import pygame
+
+from Game.Config import SCREEN_HEIGHT
+from Game.Spatial import SpatialHash
+
+COUNTS = (10, 100, 1000, 10000)
+ENTITY_SPACING = 80  # Level pixels per entity
+MOVING_FRACTION = 0.25  # Share of entities that move every tick, like zombies
+
+
+class Entity:
+    def __init__(self, rect):
+        self.rect = rect
+
+
+def make_entities(count, rng):
+    width = count * ENTITY_SPACING
+    return [Entity(pygame.Rect(rng.randint(0, width), rng.randint(SCREEN_HEIGHT - 300, SCREEN_HEIGHT - 32), 32, 32))
+            for _ in range(count)]
+
+
+def player_path(count, ticks, rng):
+    width = count * ENTITY_SPACING
+    return [pygame.Rect(rng.randint(0, width), rng.randint(SCREEN_HEIGHT - 300, SCREEN_HEIGHT - 64), 40, 64)
+            for _ in range(ticks)]
+
+
+def measure(count, ticks, seed, moving_fraction):
+    # Microseconds per tick of the linear scan, the grid query and the grid
+    # upkeep, all on the same level as it moves
+    rng = random.Random(seed)
+    entities = make_entities(count, rng)
+    players = player_path(count, ticks, rng)
+    grid = SpatialHash()
+    for entity in entities:
+        grid.insert(entity)
+    moving = entities[:int(count * moving_fraction)]
+    clock = time.perf_counter
+    linear = query = upkeep = 0.0
+    for player in players:
+        for entity in moving:
+            entity.rect.x += 1
+
+        start = clock()
+        for entity in moving:
+            grid.move(entity)
+        moved = clock()
+        found = [entity for entity in grid.query(player) if player.colliderect(entity.rect)]
+        queried = clock()
+        scanned_found = [entity for entity in entities if player.colliderect(entity.rect)]
+        scanned = clock()
+        assert len(found) == len(scanned_found)
+
+        upkeep += moved - start
+        query += queried - moved
+        linear += scanned - queried
+    scale = 1e6 / len(players)
+    return linear * scale, query * scale, upkeep * scale
+
+
+def run(counts=COUNTS, ticks=2000, seed=0, moving_fraction=MOVING_FRACTION):
+    results = []
+    for count in counts:
+        linear, query, upkeep = measure(count, ticks, seed, moving_fraction)
+        results.append({
+            "entities": count,
+            "moving": int(count * moving_fraction),
+            "linear_us_per_tick": linear,
+            "grid_query_us_per_tick": query,
+            "grid_move_us_per_tick": upkeep,
+            "grid_us_per_tick": query + upkeep,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collision broadphase benchmark")
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--moving-fraction", type=float, default=MOVING_FRACTION,
+                        help="Share of the entities that move every tick")
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args()
+
+    results = run(ticks=args.ticks, seed=args.seed, moving_fraction=args.moving_fraction)
+    print(f"{'entities':>10} {'moving':>8} {'linear us/tick':>16} {'grid query us':>14} {'grid move us':>13} {'grid total us':>14}")
+    for row in results:
+        print(f"{row['entities']:>10} {row['moving']:>8} {row['linear_us_per_tick']:>16.2f} "
+              f"{row['grid_query_us_per_tick']:>14.2f} {row['grid_move_us_per_tick']:>13.2f} "
+              f"{row['grid_us_per_tick']:>14.2f}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
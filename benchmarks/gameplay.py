@@ -0,0 +1,252 @@
+# Whole-game benchmark: scripted rounds of Game.update (and Game.draw when
+# rendering) for levels with a configurable number of zombies, platforms and
+# coins. Each scenario reports ticks per second, the mean cost of every frame
+# phase and peak Python memory, so results can be compared across commits.
+#
+#   python -m benchmarks.gameplay [--json results.json] [--baseline old.json]
+#
+# With --check-dirty the scenarios are instead drawn by the full and the dirty
+# renderer side by side, and every frame of the two must be identical.
+#
+#   python -m benchmarks.gameplay --check-dirty [--render-scale 0.5]
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from Game import Game
+from Game.Config import SCREEN_HEIGHT, SCREEN_WIDTH
+from Game.Input import ScriptedInput
+from Game.Profiler import PHASES, FrameProfiler
+from Game.Sprites import Platform
+
+ENTITY_SPACING = 80  # Level pixels per entity, so bigger levels are longer rather than denser
+
+# Scenario name -> (zombies, platforms, coins)
+LEVELS = {
+    "small": (8, 10, 20),
+    "crowded": (100, 50, 200),
+    "huge": (1000, 500, 2000),
+}
+
+
+def idle_script(ticks):
+    return [[]] * ticks
+
+
+def run_script(ticks):
+    # Hold D and jump every 40 ticks
+    return [[pygame.K_d, pygame.K_w] if tick % 40 == 0 else [pygame.K_d] for tick in range(ticks)]
+
+
+def shuffle_script(ticks):
+    # Run back and forth in 90 tick legs, jumping now and then
+    script = []
+    for tick in range(ticks):
+        keys = [pygame.K_d] if (tick // 90) % 2 == 0 else [pygame.K_a]
+        if tick % 25 == 0:
+            keys.append(pygame.K_w)
+        script.append(keys)
+    return script
+
+
+def hop_script(ticks):
+    # Short runs right, then jumping on the spot, so coins and stomps also
+    # happen while the camera stands still
+    script = []
+    for tick in range(ticks):
+        phase = tick % 60
+        script.append([pygame.K_d] if phase < 15 else [pygame.K_w] if phase in (15, 35) else [])
+    return script
+
+
+SCRIPTS = {"idle": idle_script, "run": run_script, "shuffle": shuffle_script, "hop": hop_script}
+
+
+class ScenarioGame(Game):
+    # Headless Game whose random level has fixed entity counts
+    def __init__(self, counts, **kwargs):
+        self.counts = counts
+        super().__init__(headless=True, **kwargs)
+
+    def level_width(self):
+        return max(SCREEN_WIDTH * 3, sum(self.counts) * ENTITY_SPACING)
+
+    def create_random_zombies(self):
+        return [self.new_zombie(self.random.randint(400, self.level_width()), SCREEN_HEIGHT - 70)
+                for _ in range(self.counts[0])]
+
+    def create_random_platforms(self):
+        return [Platform(self.random.randint(100, self.level_width()), self.random.randint(SCREEN_HEIGHT - 300, SCREEN_HEIGHT - 60),
+                         self.random.randint(100, 200), 20)
+                for _ in range(self.counts[1])]
+
+    def create_random_coins(self):
+        return [self.new_coin(self.random.randint(200, self.level_width()), self.random.randint(SCREEN_HEIGHT - 200, SCREEN_HEIGHT - 60))
+                for _ in range(self.counts[2])]
+
+
+def play(counts, script, render, seed, profile=False, **options):
+    # Step scripted rounds until the script runs out. A round that ends early
+    # (the player died or won) is followed by a new one with the same seed, and
+    # only time spent stepping is counted. Returns (seconds, rounds, profilers).
+    ticks = len(script)
+    done = 0
+    seconds = 0.0
+    rounds = 0
+    profilers = []
+    while done < ticks:
+        game = ScenarioGame(counts, seed=seed, input_source=ScriptedInput(script[done:]), **options)
+        if profile:
+            game.profiler = FrameProfiler(window=ticks)  # Keeps every tick of the round
+        rounds += 1
+        start = time.perf_counter()
+        while done < ticks and game.running:
+            game.step(1, render=render)
+            done += 1
+        seconds += time.perf_counter() - start
+        profilers.append(game.profiler)
+    return seconds, rounds, profilers
+
+
+def phase_means(profilers):
+    # Mean milliseconds per tick of every phase over all rounds
+    totals = dict.fromkeys(PHASES, 0.0)
+    frames = 0
+    for profiler in profilers:
+        for row in profiler.rows:
+            for name, seconds in zip(PHASES, row[3:]):
+                totals[name] += seconds
+        frames += len(profiler.rows)
+    return {name: total * 1000 / max(frames, 1) for name, total in totals.items()}
+
+
+def run_scenario(level, script_name, render, ticks, seed, **options):
+    counts = LEVELS[level]
+    script = SCRIPTS[script_name](ticks)
+
+    # Separate passes, so neither the profiler nor tracemalloc skews ticks/s
+    seconds, rounds, _ = play(counts, script, render, seed, **options)
+    _, _, profilers = play(counts, script, render, seed, profile=True, **options)
+    tracemalloc.start()
+    play(counts, script, render, seed, **options)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "scenario": f"{level}/{script_name}/{'render' if render else 'update'}",
+        "zombies": counts[0],
+        "platforms": counts[1],
+        "coins": counts[2],
+        "script": script_name,
+        "render": render,
+        "ticks": ticks,
+        "rounds": rounds,
+        "ticks_per_second": ticks / seconds,
+        "phase_ms": phase_means(profilers),
+        "peak_memory_kb": peak / 1024,
+    }
+
+
+def check_dirty(counts, script, seed, **options):
+    # Number of ticks whose dirty-mode frame differs from the full-mode one;
+    # rounds that end early are restarted with the same seed in both modes
+    ticks = len(script)
+    done = 0
+    mismatched = 0
+    while done < ticks:
+        dirty, full = (ScenarioGame(counts, seed=seed, input_source=ScriptedInput(script[done:]), record=None,
+                                    **dict(options, render_mode=mode))
+                       for mode in ("dirty", "full"))
+        # Headless games share one window; the full renderer gets a canvas of
+        # its own so it cannot paint over what the dirty one left
+        full.screen = pygame.Surface(dirty.screen.get_size())
+        while done < ticks and full.running:
+            full.step(1, render=True)
+            dirty.step(1, render=True)
+            if pygame.image.tobytes(full.screen, "RGB") != pygame.image.tobytes(dirty.screen, "RGB"):
+                mismatched += 1
+            done += 1
+    return mismatched
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(levels=tuple(LEVELS), scripts=tuple(SCRIPTS), render_modes=(False, True), ticks=600, seed=0, **options):
+    results = []
+    for level in levels:
+        for script_name in scripts:
+            for render in render_modes:
+                results.append(run_scenario(level, script_name, render, ticks, seed, **options))
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "options": options,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scripted gameplay benchmark")
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--level", action="append", choices=LEVELS, help="Level size to run; repeatable, default all")
+    parser.add_argument("--script", action="append", choices=SCRIPTS, help="Input script to run; repeatable, default all")
+    parser.add_argument("--no-render", action="store_true", help="Only benchmark update, not draw")
+    parser.add_argument("--render-mode", choices=("full", "dirty"), default="full")
+    parser.add_argument("--zombie-system", choices=("sprites", "swarm"), default="sprites")
+    parser.add_argument("--render-scale", type=float, default=1.0, help="Internal render resolution relative to 800x600")
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--baseline", help="Results file of an earlier run to compare ticks/s against")
+    parser.add_argument("--check-dirty", action="store_true",
+                        help="Check that dirty-mode frames match full-mode frames instead of benchmarking")
+    args = parser.parse_args()
+
+    if args.check_dirty:
+        failed = False
+        for level in args.level or LEVELS:
+            for script_name in args.script or SCRIPTS:
+                mismatched = check_dirty(LEVELS[level], SCRIPTS[script_name](args.ticks), args.seed,
+                                         zombie_system=args.zombie_system, render_scale=args.render_scale)
+                failed = failed or mismatched > 0
+                print(f"{level + '/' + script_name:<16} {mismatched:>5} of {args.ticks} frames differ")
+        raise SystemExit(1 if failed else 0)
+
+    report = run(levels=tuple(args.level or LEVELS), scripts=tuple(args.script or SCRIPTS),
+                 render_modes=(False,) if args.no_render else (False, True), ticks=args.ticks, seed=args.seed,
+                 render_mode=args.render_mode, zombie_system=args.zombie_system, render_scale=args.render_scale)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {row["scenario"]: row for row in json.load(f)["results"]}
+
+    print(f"{'scenario':<24} {'ticks/s':>9} {'update ms':>10} {'draw ms':>8} {'peak KiB':>9} {'vs base':>8}")
+    for row in report["results"]:
+        phases = row["phase_ms"]
+        update_ms = sum(phases[name] for name in ("zombies", "player", "platforms", "coins", "scroll"))
+        draw_ms = phases["draw"] + phases["flip"]
+        base = baseline.get(row["scenario"])
+        change = f"{row['ticks_per_second'] / base['ticks_per_second']:>7.2f}x" if base else ""
+        print(f"{row['scenario']:<24} {row['ticks_per_second']:>9.0f} {update_ms:>10.3f} {draw_ms:>8.3f} "
+              f"{row['peak_memory_kb']:>9.0f} {change:>8}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
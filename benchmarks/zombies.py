@@ -0,0 +1,72 @@
+# Per-tick cost of stepping Zombie sprites one by one against the vectorized
+# ZombieSwarm, for growing zombie counts.
+#
+#   python -m benchmarks.zombies [--json results.json]
+import argparse
+import json
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from Game.Animation import AnimationClock
+from Game.Config import SCREEN_HEIGHT
+from Game.Sprites import Zombie
+from Game.Swarm import ZombieSwarm
+
+COUNTS = (10, 100, 1000, 10000)
+
+
+def per_tick(step, ticks):
+    start = time.perf_counter()
+    for _ in range(ticks):
+        step()
+    return (time.perf_counter() - start) / ticks * 1e6
+
+
+def run(counts=COUNTS, ticks=200, seed=0):
+    clock = AnimationClock()
+    results = []
+    for count in counts:
+        rng = random.Random(seed)
+        positions = [rng.randint(0, count * 80) for _ in range(count)]
+        sprites = [Zombie(x, SCREEN_HEIGHT - 70, clock) for x in positions]
+        swarm = ZombieSwarm(clock)
+        for x in positions:
+            swarm.spawn(x, SCREEN_HEIGHT - 70)
+
+        def step_sprites():
+            for zombie in sprites:
+                zombie.update()
+
+        results.append({
+            "zombies": count,
+            "sprites_us_per_tick": per_tick(step_sprites, ticks),
+            "swarm_us_per_tick": per_tick(swarm.update, ticks),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zombie update benchmark")
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    results = run(ticks=args.ticks, seed=args.seed)
+    print(f"{'zombies':>10} {'sprites us/tick':>16} {'swarm us/tick':>14}")
+    for row in results:
+        print(f"{row['zombies']:>10} {row['sprites_us_per_tick']:>16.2f} {row['swarm_us_per_tick']:>14.2f}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,28 @@
+import argparse
+import logging
+import sys
+
 from Game import Game
+from Game.Config import ASSET_PACK
+from Game.Pack import bake
+from Game.Replay import verify
 
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="The Adventures of Py.Man")
+    parser.add_argument("--replay", nargs="+", metavar="RECORDING",
+                        help="Replay recorded rounds headless and check their scores instead of playing")
+    parser.add_argument("--bake-assets", action="store_true",
+                        help=f"Decode and scale the startup images into {ASSET_PACK} instead of playing")
+    args = parser.parse_args()
+    if args.bake_assets:
+        count, size = bake(ASSET_PACK)
+        print(f"Baked {count} images into {ASSET_PACK} ({size / 1024:.0f} KiB)")
+        sys.exit(0)
+    if args.replay:
+        sys.exit(1 if verify(args.replay) else 0)
+
+    logging.basicConfig(level=logging.INFO)
     game = Game()
     game.run()